@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Asyncio client for OpenWeatherMap
+Refreshes many locations from a single event loop with bounded concurrency
+"""
+
+import asyncio
+import requests
+from weather_api import WeatherAPI
+from rate_limiter import RateLimiter
+from config import (ASYNC_MAX_CONCURRENCY, QUOTA_MAX_WAIT_SECONDS,
+                    OWM_CALLS_PER_MINUTE, OWM_CALLS_PER_DAY)
+
+try:
+    import aiohttp
+    # A failed request: network, HTTP status, timeout, open circuit or exhausted quota
+    FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, requests.exceptions.RequestException)
+except ImportError:
+    aiohttp = None
+    FETCH_ERRORS = (requests.exceptions.RequestException,)
+
+
+class AsyncWeatherAPI:
+    """Coroutine counterpart of WeatherAPI
+
+    Wraps a WeatherAPI for its settings, provider, caches, circuit breakers,
+    quota limiter and response parsing, and only replaces the HTTP calls,
+    so get_weather_data() returns exactly the same dict shape.
+    """
+
+    def __init__(self, api=None, session=None, semaphore=None):
+        """
+        Args:
+            api: WeatherAPI for the location; defaults to the configured city
+            session: Shared aiohttp session, normally supplied by
+                fetch_locations() so many instances share one connection pool
+            semaphore: Shared limit on requests in flight
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp module not found - run: pip3 install aiohttp")
+
+        self.api = api or WeatherAPI()
+        self.http = session
+        self._owns_http = session is None
+        self.semaphore = semaphore
+
+    @property
+    def location_query(self):
+        return self.api.location_query
+
+    async def _get_json(self, endpoint, params, base_url=None):
+        """GET an API endpoint and return the decoded JSON
+
+        Goes through the same response cache, circuit breaker and quota
+        limiter as WeatherAPI._get_json(). Raises one of FETCH_ERRORS on failure.
+        """
+        api = self.api
+        if api.response_cache:
+            # Cache files are read and written off the event loop
+            cached = await asyncio.to_thread(api.response_cache.get, endpoint, params)
+            if cached is not None:
+                return cached
+
+        breaker = api._get_breaker(endpoint)
+        probe = breaker.before_call()
+
+        url = f"{base_url or api.base_url}/{endpoint}"
+        timeout = aiohttp.ClientTimeout(total=api.timeouts.get(endpoint, 10))
+        try:
+            # Running out of quota says nothing about the endpoint, so it
+            # isn't recorded as a failure
+            if api.rate_limiter:
+                await self._acquire_quota()
+
+            try:
+                if self.semaphore is None:
+                    data = await self._request(url, params, timeout)
+                else:
+                    async with self.semaphore:
+                        data = await self._request(url, params, timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+        finally:
+            # Also covers cancellation, which must not hold a half-open circuit
+            if probe:
+                breaker.release()
+
+        if api.response_cache:
+            await asyncio.to_thread(api.response_cache.set, endpoint, params, data)
+        return data
+
+    async def _acquire_quota(self):
+        """Take a call from the shared quota, waiting without blocking the loop"""
+        waited = 0.0
+        while True:
+            wait = self.api.rate_limiter.try_acquire(QUOTA_MAX_WAIT_SECONDS, waited)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+            waited += wait
+
+    async def _request(self, url, params, timeout):
+        if self.http is None:
+            self.http = aiohttp.ClientSession()
+        async with self.http.get(url, params=params, timeout=timeout) as response:
+            if response.status == 429 and self.api.rate_limiter:
+                self.api.rate_limiter.record_throttled()
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def close(self):
+        """Close the aiohttp session if this instance created it"""
+        if self.http is not None and self._owns_http:
+            await self.http.close()
+            self.http = None
+
+    async def _remember_location(self, data):
+        # May write the coordinate cache file
+        return await asyncio.to_thread(self.api._remember_location, data)
+
+    async def get_current_weather(self):
+        """Fetch current weather data, with UV index and air quality"""
+        api = self.api
+        location = api.coord_cache.get(api.location_query)
+        pending = []
+        if location:
+            # Coordinates are cached, so UV and air quality can start right away
+            pending = self._start_location_tasks(location)
+
+        params = {
+            **api._location_params(location),
+            'appid': api.api_key,
+            'units': api.units
+        }
+
+        try:
+            try:
+                data = await self._get_json('weather', params)
+            except FETCH_ERRORS as e:
+                print(f"Error fetching current weather for {api.location_query}: {e}")
+                return None
+
+            if location is None:
+                location = await self._remember_location(data)
+                pending = self._start_location_tasks(location)
+
+            uv_index, air_quality = await asyncio.gather(*pending)
+            return api._parse_current_weather(data, uv_index, air_quality, location)
+        finally:
+            # Don't leave UV/air quality requests running after a failure or cancellation
+            for task in pending:
+                task.cancel()
+
+    def _start_location_tasks(self, location):
+        return [
+            asyncio.ensure_future(self.get_uv_index(location['lat'], location['lon'])),
+            asyncio.ensure_future(self.get_air_quality(location['lat'], location['lon'])),
+        ]
+
+    async def get_uv_index(self, lat, lon):
+        """Fetch UV index data"""
+        try:
+            data = await self._get_json('uvi', {'lat': lat, 'lon': lon, 'appid': self.api.api_key})
+            return round(data.get('value', 0), 1)
+        except Exception:
+            pass
+        return 0
+
+    async def get_air_quality(self, lat, lon):
+        """Fetch air quality data"""
+        try:
+            data = await self._get_json('air_pollution', {'lat': lat, 'lon': lon, 'appid': self.api.api_key})
+            aqi = data['list'][0]['main']['aqi']
+            aqi_text = ['Good', 'Fair', 'Moderate', 'Poor', 'Very Poor']
+            return {'index': aqi, 'description': aqi_text[min(aqi-1, 4)]}
+        except Exception:
+            pass
+        return {'index': 0, 'description': 'N/A'}
+
+    async def get_forecast(self, days=10):
+        """Fetch weather forecast for specified number of days"""
+        api = self.api
+        params = {
+            **api._location_params(),
+            'appid': api.api_key,
+            'units': api.units
+        }
+
+        try:
+            data = await self._get_json('forecast', params)
+            return api._parse_forecast(data, days)
+        except FETCH_ERRORS as e:
+            print(f"Error fetching forecast for {api.location_query}: {e}")
+            return {'daily': [], 'hourly': []}
+
+    async def get_onecall_weather_data(self):
+        """Get current weather and forecast from a single One Call request"""
+        api = self.api
+        location = api.coord_cache.get(api.location_query)
+        if location is None:
+            # One Call only takes coordinates; look them up by name once
+            params = {'q': api.location_query, 'appid': api.api_key, 'units': api.units}
+            try:
+                location = await self._remember_location(await self._get_json('weather', params))
+            except FETCH_ERRORS as e:
+                print(f"Error looking up coordinates for {api.location_query}: {e}")
+                return api._merge_weather_data(None, {'daily': [], 'hourly': []})
+
+        params = {
+            'lat': location['lat'],
+            'lon': location['lon'],
+            'exclude': 'minutely,alerts',
+            'appid': api.api_key,
+            'units': api.units
+        }
+
+        air_task = asyncio.ensure_future(self.get_air_quality(location['lat'], location['lon']))
+        try:
+            try:
+                data = await self._get_json('onecall', params, base_url=api.onecall_url)
+            except FETCH_ERRORS as e:
+                print(f"Error fetching One Call weather for {api.location_query}: {e}")
+                data = None
+            air_quality = await air_task
+        finally:
+            air_task.cancel()
+
+        if data is None:
+            return api._merge_weather_data(None, {'daily': [], 'hourly': []})
+        current = api._parse_onecall_current(data, air_quality, location)
+        return api._merge_weather_data(current, api._parse_onecall_forecast(data))
+
+    async def get_weather_data(self):
+        """Get both current weather and forecast data, from the configured provider"""
+        if self.api.provider == 'onecall':
+            return await self.get_onecall_weather_data()
+
+        forecast_task = asyncio.ensure_future(self.get_forecast())
+        try:
+            current = await self.get_current_weather()
+            forecast = await forecast_task
+        finally:
+            forecast_task.cancel()
+        return self.api._merge_weather_data(current, forecast)
+
+
+async def fetch_locations(locations, max_concurrency=ASYNC_MAX_CONCURRENCY, timeout=None, rate_limiter=None):
+    """Refresh many locations concurrently from one event loop
+
+    Args:
+        locations: List of (city, country, units) tuples
+        max_concurrency: Maximum number of HTTP requests in flight at once
+        timeout: Optional per-location deadline in seconds; a location that
+            misses it is cancelled and returned as None
+        rate_limiter: RateLimiter to draw calls from, as in batch_fetch.fetch_batch()
+
+    Returns:
+        list: get_weather_data() results in the same order as locations; a
+            location that failed is None and doesn't affect the others
+    """
+    if aiohttp is None:
+        raise ImportError("aiohttp module not found - run: pip3 install aiohttp")
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(OWM_CALLS_PER_MINUTE, OWM_CALLS_PER_DAY)
+
+    def make_apis():
+        # The coordinate cache may be read from disk on first use; the
+        # requests session is shared and never used for requests
+        apis = []
+        session = None
+        for city, country, units in locations:
+            api = WeatherAPI(city, country, units, rate_limiter=rate_limiter, session=session)
+            session = api.session
+            apis.append(api)
+        return apis
+
+    apis = await asyncio.to_thread(make_apis)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    connector = aiohttp.TCPConnector(limit=max_concurrency)
+
+    try:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def fetch_one(api):
+                client = AsyncWeatherAPI(api, session=session, semaphore=semaphore)
+                try:
+                    return await asyncio.wait_for(client.get_weather_data(), timeout)
+                except asyncio.TimeoutError:
+                    print(f"Timed out fetching weather for {client.location_query}")
+                except Exception as e:
+                    print(f"Error fetching weather for {client.location_query}: {e}")
+                return None
+
+            # gather() cancels every outstanding location if the caller is cancelled
+            return await asyncio.gather(*(fetch_one(api) for api in apis))
+    finally:
+        if apis:
+            apis[0].close()
+
+
+def test_async_weather_api():
+    """Test function to verify the async client against the configured city"""
+    from config import CITY_NAME, COUNTRY_CODE, UNITS
+    try:
+        results = asyncio.run(fetch_locations([(CITY_NAME, COUNTRY_CODE, UNITS)]))
+        data = results[0]
+        if data and data['current']:
+            print("✅ Async weather API connection successful!")
+            print(f"Current temperature in {data['current']['city']}: {data['current']['temperature']}°")
+        else:
+            print("❌ Failed to fetch weather data")
+    except Exception as e:
+        print(f"❌ Error testing async weather API: {e}")
+
+if __name__ == "__main__":
+    test_async_weather_api()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Batch weather fetch for many locations under a shared OpenWeatherMap quota
+Packs as many locations as the quota allows without tripping 429 responses
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from weather_api import WeatherAPI
+from rate_limiter import RateLimiter
+from config import OWM_CALLS_PER_MINUTE, OWM_CALLS_PER_DAY, BATCH_MAX_WORKERS
+
+
+def fetch_batch(locations, rate_limiter=None, max_workers=BATCH_MAX_WORKERS):
+    """Fetch weather data for a list of locations
+
+    Args:
+        locations: List of (city, country, units) tuples
+        rate_limiter: RateLimiter to draw calls from. Pass the same instance
+            to every batch so the per-day budget carries over between runs.
+        max_workers: Number of locations fetched at the same time
+
+    Returns:
+        dict: {'results': [...], 'quota': {...}, 'elapsed_seconds': float}
+            Each result has 'city', 'country', 'units', 'ok' and 'data' (the
+            get_weather_data() dict, or None if the fetch failed).
+    """
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(OWM_CALLS_PER_MINUTE, OWM_CALLS_PER_DAY)
+
+    # All locations share one connection pool and one quota
+    apis = []
+    session = None
+    for city, country, units in locations:
+        api = WeatherAPI(city, country, units, rate_limiter=rate_limiter, session=session)
+        session = api.session
+        apis.append(api)
+
+    def fetch_one(api):
+        try:
+            # Parallelism comes from fetching several locations at once, so
+            # keep each location's own calls serial
+            return api.get_weather_data(concurrent=False)
+        except Exception as e:
+            print(f"Error fetching weather for {api.location_query}: {e}")
+            return None
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        payloads = list(executor.map(fetch_one, apis))
+    elapsed = time.monotonic() - start
+
+    if session is not None:
+        session.close()
+
+    results = []
+    for (city, country, units), data in zip(locations, payloads):
+        results.append({
+            'city': city,
+            'country': country,
+            'units': units,
+            'ok': bool(data and data.get('current')),
+            'data': data,
+        })
+
+    return {
+        'results': results,
+        'quota': rate_limiter.get_stats(),
+        'elapsed_seconds': elapsed,
+    }
+
+
+def main():
+    """Fetch the locations given on the command line as CITY,COUNTRY[,UNITS]"""
+    import sys
+    from config import UNITS
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 batch_fetch.py CITY,COUNTRY[,UNITS] [CITY,COUNTRY[,UNITS] ...]")
+        sys.exit(1)
+
+    locations = []
+    for arg in sys.argv[1:]:
+        parts = arg.split(',')
+        locations.append((parts[0], parts[1] if len(parts) > 1 else '', parts[2] if len(parts) > 2 else UNITS))
+
+    batch = fetch_batch(locations)
+
+    print("\n" + "=" * 50)
+    for result in batch['results']:
+        status = "✅" if result['ok'] else "❌"
+        temp = f"{result['data']['current']['temperature']}°" if result['ok'] else "failed"
+        print(f"{status} {result['city']}, {result['country']}: {temp}")
+
+    quota = batch['quota']
+    print(f"\nFetched {len(locations)} locations in {batch['elapsed_seconds']:.1f}s")
+    print(f"API calls: {quota['calls']} (waited {quota['waited_seconds']:.1f}s, "
+          f"{quota['rejected']} rejected, {quota['throttled']} throttled)")
+    print(f"Quota left: {quota['remaining_minute']}/{quota['calls_per_minute']} this minute, "
+          f"{quota['remaining_day']}/{quota['calls_per_day']} today")
+
+if __name__ == "__main__":
+    main()
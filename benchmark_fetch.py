@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the weather fetch path against the local OpenWeatherMap stand-in
+Compares serial, pooled, concurrent and cached fetching reproducibly, no network needed
+
+Run: python3 benchmark_fetch.py --latency 0.1 --runs 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+# The stand-in accepts any key; set one before config reads the environment
+os.environ.setdefault('OPENWEATHER_API_KEY', 'standin')
+
+from owm_standin import StandInServer
+from weather_api import WeatherAPI
+from coordinate_cache import CoordinateCache
+from response_cache import ResponseCache
+from config import RESPONSE_CACHE_TTLS, RESPONSE_CACHE_MAX_BYTES
+
+
+def make_api(server, workdir, provider='classic', keep_alive=True, cached_coords=False, cached_responses=False):
+    """Create a WeatherAPI pointed at the stand-in with isolated caches"""
+    api = WeatherAPI(provider=provider)
+    api.base_url = f"{server.url}/data/2.5"
+    api.onecall_url = f"{server.url}/data/3.0"
+
+    coords_path = os.path.join(workdir, 'coordinates.json')
+    if not cached_coords and os.path.exists(coords_path):
+        os.remove(coords_path)
+    api.coord_cache = CoordinateCache(coords_path)
+
+    api.response_cache = None
+    if cached_responses:
+        api.response_cache = ResponseCache(os.path.join(workdir, 'responses'),
+                                           RESPONSE_CACHE_TTLS, RESPONSE_CACHE_MAX_BYTES)
+
+    if not keep_alive:
+        api.session.headers['Connection'] = 'close'
+    return api
+
+
+def time_fetches(api, runs, **kwargs):
+    """Time repeated get_weather_data() calls on one instance"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = api.get_weather_data(**kwargs)
+        timings.append(time.perf_counter() - start)
+        if not data or not data.get('current'):
+            raise RuntimeError("Fetch failed - is the stand-in serving every route?")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WeatherAPI against the local stand-in")
+    parser.add_argument('--latency', type=float, default=0.1, help="Stand-in latency per request (seconds)")
+    parser.add_argument('--runs', type=int, default=5, help="Fetches per scenario")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='owm-bench-')
+    try:
+        with StandInServer(latency=args.latency) as server:
+            # Prime the coordinate cache once for the scenarios that rely on it
+            with contextlib.redirect_stdout(io.StringIO()):
+                make_api(server, workdir).get_current_weather()
+
+            # (name, first run, make_api() options, get_weather_data() options)
+            scenarios = [
+                ("Serial, new connection per call", False, dict(keep_alive=False, cached_coords=True), dict(concurrent=False)),
+                ("Serial, pooled keep-alive", False, dict(cached_coords=True), dict(concurrent=False)),
+                ("Concurrent, first run (city lookup)", True, dict(), dict(concurrent=True)),
+                ("Concurrent, cached coordinates", False, dict(cached_coords=True), dict(concurrent=True)),
+                ("Concurrent, warm response cache", False, dict(cached_coords=True, cached_responses=True), dict(concurrent=True)),
+                ("One Call mode", False, dict(provider='onecall', cached_coords=True), dict()),
+            ]
+
+            print(f"Stand-in latency: {args.latency * 1000:.0f} ms per request, {args.runs} runs per scenario")
+            print("=" * 72)
+            print(f"{'Scenario':42} {'mean ms':>9} {'min ms':>9} {'requests':>9}")
+            print("-" * 72)
+
+            for name, first_run, api_options, fetch_options in scenarios:
+                if first_run:
+                    # A fresh instance with no saved coordinates for every fetch
+                    requests_before = server.stats['requests']
+                    timings = []
+                    for _ in range(args.runs):
+                        api = make_api(server, workdir, **api_options)
+                        timings += time_fetches(api, 1, **fetch_options)
+                        api.close()
+                else:
+                    # One untimed fetch opens the connections and fills any cache
+                    api = make_api(server, workdir, **api_options)
+                    time_fetches(api, 1, **fetch_options)
+                    requests_before = server.stats['requests']
+                    timings = time_fetches(api, args.runs, **fetch_options)
+                    api.close()
+                requests_made = server.stats['requests'] - requests_before
+
+                print(f"{name:42} {statistics.mean(timings) * 1000:9.1f} {min(timings) * 1000:9.1f} "
+                      f"{requests_made / args.runs:9.1f}")
+
+            print("=" * 72)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
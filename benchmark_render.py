@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the dashboard renderer
+Times the optimised rendering primitives against the code they replaced
+
+Run: python3 benchmark_render.py
+"""
+
+import argparse
+import importlib
+import random
+import statistics
+import time
+import numpy as np
+from PIL import Image, ImageDraw, ImageEnhance
+
+from image_ops import tint_icon, gradient_area_fill, vertical_gradient
+from spline import catmull_rom_batch
+from color_grade import grade_frame
+from font_registry import get_font_registry
+from glyph_atlas import get_glyph_atlas
+from panel_palette import DITHER_MODES, driver_palette, palette_image, quantize_to_panel
+
+
+def measure(func, runs):
+    """Return (mean ms, min ms) over runs calls of func"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(timings), min(timings)
+
+
+def print_row(name, baseline, optimised, note=''):
+    speedup = baseline[0] / optimised[0] if optimised[0] else float('inf')
+    print(f"{name:28} {baseline[0]:10.2f} {optimised[0]:10.2f} {speedup:8.1f}x  {note}")
+
+
+def _make_icon_yellow_loop(icon, color=(255, 220, 0)):
+    """Previous per-pixel implementation of the sunrise/sunset tint"""
+    icon = icon.copy()
+    pixels = icon.load()
+    width, height = icon.size
+    for y in range(height):
+        for x in range(width):
+            r, g, b, a = pixels[x, y]
+            if a > 0:
+                brightness = (r + g + b) / 3 / 255
+                pixels[x, y] = (int(color[0] * brightness), int(color[1] * brightness),
+                                int(color[2] * brightness), a)
+    return icon
+
+
+def bench_tint(runs):
+    print("Icon tint: per-pixel loop vs tint_icon()")
+    with Image.open('icons/sunrise.png') as source:
+        source = source.convert('RGBA')
+
+    for size in (38, 76, 152, 256):
+        icon = source.resize((size, size), Image.Resampling.LANCZOS)
+        if tint_icon(icon, (255, 220, 0)).tobytes() != _make_icon_yellow_loop(icon).tobytes():
+            raise AssertionError(f"tint_icon output differs from the loop at {size}px")
+
+        baseline = measure(lambda: _make_icon_yellow_loop(icon), runs)
+        optimised = measure(lambda: tint_icon(icon, (255, 220, 0)), runs)
+        print_row(f"  {size}x{size}", baseline, optimised, "identical")
+
+
+def _bezier_curve_loop(points, num_segments=50):
+    """Previous per-point Catmull-Rom implementation"""
+    if len(points) < 2:
+        return points
+    result = []
+    for i in range(len(points) - 1):
+        p0 = points[max(0, i - 1)]
+        p1 = points[i]
+        p2 = points[i + 1]
+        p3 = points[min(len(points) - 1, i + 2)]
+        for t_step in range(num_segments):
+            t = t_step / num_segments
+            t2 = t * t
+            t3 = t2 * t
+            x = 0.5 * ((2 * p1[0]) + (-p0[0] + p2[0]) * t +
+                       (2 * p0[0] - 5 * p1[0] + 4 * p2[0] - p3[0]) * t2 +
+                       (-p0[0] + 3 * p1[0] - 3 * p2[0] + p3[0]) * t3)
+            y = 0.5 * ((2 * p1[1]) + (-p0[1] + p2[1]) * t +
+                       (2 * p0[1] - 5 * p1[1] + 4 * p2[1] - p3[1]) * t2 +
+                       (-p0[1] + 3 * p1[1] - 3 * p2[1] + p3[1]) * t3)
+            result.append((int(x), int(y)))
+    result.append(points[-1])
+    return result
+
+
+def bench_spline(runs):
+    print("Graph splines: per-point loop vs catmull_rom_batch()")
+    rng = random.Random(42)
+    # 8 points is the 24 hour graph; 48 points would be an hourly 2-day graph
+    for count in (8, 48):
+        series = [[(85 + i * 590 // (count - 1), rng.randint(257, 337)) for i in range(count)]
+                  for _ in range(2)]
+        if catmull_rom_batch(series, 20) != [_bezier_curve_loop(points, 20) for points in series]:
+            raise AssertionError(f"catmull_rom_batch output differs from the loop for {count} points")
+
+        baseline = measure(lambda: [_bezier_curve_loop(points, 20) for points in series], runs)
+        optimised = measure(lambda: catmull_rom_batch(series, 20), runs)
+        print_row(f"  2 series x {count} points", baseline, optimised, "identical")
+
+
+def _gradient_overlay_fill(img, curve, baseline, color, height):
+    """Previous gradient fill: 30 shifted polygons on a full-frame overlay"""
+    overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
+    overlay_draw = ImageDraw.Draw(overlay)
+    num_layers = 30
+    for layer in range(num_layers):
+        alpha = int(80 * (1 - layer / num_layers))
+        y_offset = int((height * layer) / num_layers)
+        layer_points = [(px, py + y_offset) for px, py in curve]
+        layer_points.append((int(curve[-1][0]), int(baseline)))
+        layer_points.append((int(curve[0][0]), int(baseline)))
+        overlay_draw.polygon(layer_points, fill=(*color, alpha))
+    img.paste(overlay, (0, 0), overlay)
+
+
+def bench_gradient(runs):
+    print("Graph gradients: full-frame overlays vs gradient_area_fill()")
+    temps = [54, 55, 53, 57, 60, 58, 52, 50]
+    rain = [0, 10, 40, 80, 100, 60, 20, 0]
+    graph_x, graph_y, graph_width, graph_height = 85, 257, 590, 80
+    step = graph_width / (len(temps) - 1)
+    curves = catmull_rom_batch([
+        [(int(graph_x + i * step), int(graph_y + graph_height - (t - 50) / 10 * graph_height)) for i, t in enumerate(temps)],
+        [(int(graph_x + i * step), int(graph_y + graph_height - r / 100 * graph_height)) for i, r in enumerate(rain)],
+    ], 20)
+    colors = [(255, 140, 66), (100, 150, 255)]
+    baseline = graph_y + graph_height
+
+    def render(fill, size):
+        img = Image.new('RGB', size, (5, 8, 15))
+        for curve, color in zip(curves, colors):
+            fill(img, curve, baseline, color, graph_height)
+        return img
+
+    for size in ((800, 480), (1600, 1200)):
+        if render(gradient_area_fill, size).tobytes() != render(_gradient_overlay_fill, size).tobytes():
+            raise AssertionError(f"gradient_area_fill output differs at {size[0]}x{size[1]}")
+
+        baseline_time = measure(lambda: render(_gradient_overlay_fill, size), runs)
+        optimised = measure(lambda: render(gradient_area_fill, size), runs)
+        print_row(f"  {size[0]}x{size[1]}, 2 series", baseline_time, optimised, "identical")
+
+
+def _scanline_background(size, top_color, bottom_color):
+    """Previous background: one draw.line per scanline"""
+    width, height = size
+    img = Image.new('RGB', size)
+    draw = ImageDraw.Draw(img)
+    for y in range(height):
+        factor = y / height
+        color = tuple(int(top * (1 - factor) + bottom * factor) for top, bottom in zip(top_color, bottom_color))
+        draw.line([(0, y), (width, y)], fill=color)
+    return img
+
+
+def bench_background(runs):
+    print("Background: per-scanline lines vs cached plate copy")
+    palette = ((5, 8, 15), (0, 0, 0))
+    for size in ((800, 480), (1600, 1200)):
+        if vertical_gradient(size, *palette).tobytes() != _scanline_background(size, *palette).tobytes():
+            raise AssertionError(f"vertical_gradient output differs at {size[0]}x{size[1]}")
+
+        baseline = measure(lambda: _scanline_background(size, *palette), runs)
+        optimised = measure(lambda: vertical_gradient(size, *palette).copy(), runs)
+        print_row(f"  {size[0]}x{size[1]}", baseline, optimised, "identical")
+
+
+def _dashboard_like_frame(size):
+    """Frame with the dashboard's mix of dark plate, gradients, icons and text"""
+    img = vertical_gradient(size, (5, 8, 15), (0, 0, 0)).copy()
+    width, height = size
+    curves = catmull_rom_batch([
+        [(int(width * (0.1 + 0.8 * i / 7)), int(height * (0.55 + 0.12 * ((i * 3) % 5) / 4))) for i in range(8)],
+        [(int(width * (0.1 + 0.8 * i / 7)), int(height * (0.6 + 0.1 * ((i * 2) % 3) / 2))) for i in range(8)],
+    ], 20)
+    for curve, color in zip(curves, [(255, 140, 66), (100, 150, 255)]):
+        gradient_area_fill(img, curve, int(height * 0.7), color, int(height * 0.17))
+    draw = ImageDraw.Draw(img)
+    for i, name in enumerate(('clear_day', 'rain_day', 'partly_cloudy_day', 'snow_day', 'thunderstorm')):
+        with Image.open(f'icons/{name}.png') as icon:
+            icon = icon.convert('RGBA').resize((height // 5,) * 2, Image.Resampling.LANCZOS)
+        img.paste(icon, (int(width * (0.05 + 0.18 * i)), int(height * 0.78)), icon)
+        draw.text((int(width * (0.05 + 0.18 * i)), int(height * 0.1)), f"{54 + i}°F", fill=(255, 255, 255))
+    return img
+
+
+def _inky_driver(size):
+    """Inky driver for a panel size, created without touching the hardware, or None"""
+    modules = {(600, 448): 'inky.inky_uc8159', (640, 400): 'inky.inky_uc8159', (800, 480): 'inky.inky_ac073tc1a'}
+    if size not in modules:
+        return None
+    try:
+        return importlib.import_module(modules[size]).Inky(resolution=size)
+    except Exception:
+        return None
+
+
+def bench_quantize(runs):
+    print("Panel quantization: the Inky driver's set_image() vs quantize_to_panel() per mode")
+    for size in ((800, 480), (1600, 1200)):
+        img = _dashboard_like_frame(size)
+        driver = _inky_driver(size)
+
+        if driver is not None:
+            palette = driver_palette(driver)
+
+            def driver_convert():
+                # The driver quantizes an RGB frame against its blended palette
+                driver.set_image(img)
+                return driver.buf
+        else:
+            palette = None
+            nominal = palette_image('impression')
+            print(f"  {size[0]}x{size[1]}: no Inky driver installed for this size, "
+                  f"timing against the nominal palette without checking parity")
+
+            def driver_convert():
+                img.load()
+                return img.im.convert('P', True, nominal.im)
+
+        reference = np.array(driver_convert()).ravel() if driver is not None else None
+        baseline = measure(driver_convert, runs)
+        for mode in DITHER_MODES:
+            frame = quantize_to_panel(img, 'impression', mode, palette)
+            note = ''
+            if reference is not None:
+                note = "identical to the driver" if np.array_equal(np.asarray(frame).ravel(), reference) else f"{mode} dither"
+            optimised = measure(lambda: quantize_to_panel(img, 'impression', mode, palette), runs)
+            print_row(f"  {size[0]}x{size[1]}, {mode}", baseline, optimised, note)
+
+
+def _enhance_passes(img):
+    """Previous final enhancement: two chained ImageEnhance passes"""
+    img = ImageEnhance.Contrast(img).enhance(1.4)
+    return ImageEnhance.Color(img).enhance(1.3)
+
+
+def bench_enhance(runs):
+    print("Frame enhancement: ImageEnhance Contrast + Color vs grade_frame()")
+    for size in ((800, 480), (1600, 1200)):
+        img = _dashboard_like_frame(size)
+        difference = np.abs(np.asarray(grade_frame(img), dtype=np.int16) - np.asarray(_enhance_passes(img), dtype=np.int16))
+        if difference.max() > 1:
+            raise AssertionError(f"grade_frame output differs by {difference.max()} levels at {size[0]}x{size[1]}")
+
+        baseline = measure(lambda: _enhance_passes(img), runs)
+        optimised = measure(lambda: grade_frame(img), runs)
+        print_row(f"  {size[0]}x{size[1]}", baseline, optimised, f"within 1 level ({(difference > 0).mean():.1%} of values off by 1)")
+
+
+def bench_glyphs(runs):
+    print("Numeric readouts: ImageDraw.text vs glyph atlas, one frame's worth")
+    fonts = get_font_registry(1024)
+    readouts = [
+        (fonts.font('regular', 90), (232, 100), "54"),
+        (fonts.font('regular', 42), (323, 100), "°F"),
+        (fonts.font('regular', 13), (42, 252), "60°F"),
+        (fonts.font('regular', 13), (42, 327), "50°F"),
+    ] + [(fonts.font('medium', 13), (60 + i * 117, 443), f"{60 + i} / {48 - i}°") for i in range(6)]
+    background = vertical_gradient((800, 480), (5, 8, 15), (0, 0, 0))
+
+    def with_draw_text():
+        img = background.copy()
+        draw = ImageDraw.Draw(img)
+        for font, xy, text in readouts:
+            draw.text(xy, text, font=font, fill=(255, 255, 255))
+        return img
+
+    def with_atlas():
+        img = background.copy()
+        for font, xy, text in readouts:
+            get_glyph_atlas(font).draw(img, xy, text, (255, 255, 255))
+        return img
+
+    start = time.perf_counter()
+    for font, _, _ in readouts:
+        get_glyph_atlas(font)
+    print(f"  atlas build (once per font and size): {(time.perf_counter() - start) * 1000:.1f} ms")
+    if with_atlas().tobytes() != with_draw_text().tobytes():
+        raise AssertionError("glyph atlas output differs from ImageDraw.text")
+
+    copy_time = measure(background.copy, runs)
+    baseline = measure(with_draw_text, runs)
+    optimised = measure(with_atlas, runs)
+    # Leave out the frame copy both variants make
+    baseline = (baseline[0] - copy_time[0], baseline[1] - copy_time[1])
+    optimised = (optimised[0] - copy_time[0], optimised[1] - copy_time[1])
+    print_row(f"  {len(readouts)} readouts", baseline, optimised, "identical")
+
+
+BENCHMARKS = {
+    'tint': bench_tint,
+    'spline': bench_spline,
+    'gradient': bench_gradient,
+    'background': bench_background,
+    'quantize': bench_quantize,
+    'enhance': bench_enhance,
+    'glyphs': bench_glyphs,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark renderer primitives")
+    parser.add_argument('benchmarks', nargs='*', help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--runs', type=int, default=20, help="Timed runs per measurement")
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark {name!r}")
+
+    print(f"{'':28} {'before ms':>10} {'after ms':>10} {'speedup':>9}")
+    print("=" * 72)
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args.runs)
+        print("-" * 72)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-endpoint circuit breaker for OpenWeatherMap requests
+Stops waiting through full timeouts on every cycle while the API is down
+"""
+
+import threading
+import time
+import requests
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of making a request while the circuit is open"""
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        """
+        Args:
+            name: Endpoint name, used in error messages
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before letting a probe request through
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Check whether a request may go out
+
+        Returns:
+            bool: True if this request is the half-open probe, which must end
+                with record_success(), record_failure() or release()
+
+        Raises:
+            CircuitOpenError: While open, or while a half-open probe is already running
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let exactly one probe request through to test the endpoint
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.OPEN or (self.state == self.HALF_OPEN and self._probe_in_flight):
+                remaining = max(0, self.reset_timeout - (time.monotonic() - self.opened_at))
+                raise CircuitOpenError(f"Circuit open for {self.name} (retry in {remaining:.0f}s)")
+
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        """Give back a half-open probe that ended without an answer from the endpoint
+
+        Otherwise a probe stopped by the quota limiter or a non-network error
+        would hold the circuit half-open, failing every later call. Does
+        nothing once record_success() or record_failure() has run.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"Circuit opened for {self.name} after {self.failures} failure(s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
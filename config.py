@@ -10,10 +10,111 @@ CITY_NAME = os.getenv('CITY_NAME', 'London')
 COUNTRY_CODE = os.getenv('COUNTRY_CODE', 'UK')
 UNITS = os.getenv('UNITS', 'metric')  # metric, imperial, or kelvin
 
+# Weather data source: 'classic' calls /weather, /uvi, /air_pollution and
+# /forecast separately; 'onecall' gets current, hourly and daily data in one
+# One Call request and only fetches air quality separately
+WEATHER_PROVIDER = os.getenv('WEATHER_PROVIDER', 'classic')
+
+# API base URLs (override to point at a local stand-in server)
+OWM_BASE_URL = os.getenv('OWM_BASE_URL', 'http://api.openweathermap.org/data/2.5')
+OWM_ONECALL_URL = os.getenv('OWM_ONECALL_URL', 'https://api.openweathermap.org/data/3.0')
+
+# HTTP connection pool settings for OpenWeatherMap requests
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '4'))  # Connections kept per host
+HTTP_KEEP_ALIVE = os.getenv('HTTP_KEEP_ALIVE', 'true').lower() == 'true'
+
+# Request timeouts per endpoint (seconds)
+API_TIMEOUTS = {
+    'weather': 10,
+    'forecast': 10,
+    'uvi': 5,
+    'air_pollution': 5,
+    'onecall': 10,
+}
+
+# On-disk cache of city coordinates so UV/air quality/forecast can be fetched
+# by lat/lon without waiting for the city-name lookup
+COORD_CACHE_FILE = os.getenv('COORD_CACHE_FILE', 'cache/coordinates.json')
+
+# On-disk response cache that survives service restarts
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', 'cache/responses')
+RESPONSE_CACHE_MAX_BYTES = 5 * 1024 * 1024
+# How long each endpoint's response stays fresh (seconds). Current conditions
+# stay shorter than UPDATE_INTERVAL_MINUTES so scheduled updates get fresh data;
+# the 3-hourly forecast and hourly air quality change far less often.
+RESPONSE_CACHE_TTLS = {
+    'weather': 10 * 60,
+    'forecast': 60 * 60,
+    'uvi': 60 * 60,
+    'air_pollution': 60 * 60,
+    'onecall': 10 * 60,
+}
+
+# Circuit breaker: after this many consecutive failures an endpoint is skipped
+# for CIRCUIT_RESET_SECONDS, then a single probe request tests it again
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_SECONDS = 300
+
+# Overlap the endpoint calls of each update instead of running them in series
+FETCH_CONCURRENTLY = os.getenv('FETCH_CONCURRENTLY', 'true').lower() == 'true'
+
+# OpenWeatherMap quota for batch fetches (free tier limits)
+OWM_CALLS_PER_MINUTE = int(os.getenv('OWM_CALLS_PER_MINUTE', '60'))
+OWM_CALLS_PER_DAY = int(os.getenv('OWM_CALLS_PER_DAY', '1000'))
+QUOTA_MAX_WAIT_SECONDS = 120  # Give up on a call rather than wait longer for quota
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '4'))
+
+# Maximum requests in flight when refreshing many locations with AsyncWeatherAPI
+ASYNC_MAX_CONCURRENCY = int(os.getenv('ASYNC_MAX_CONCURRENCY', '10'))
+
 # Display configuration
 UPDATE_INTERVAL_MINUTES = 20
-DISPLAY_WIDTH = 800
-DISPLAY_HEIGHT = 480
+DISPLAY_WIDTH = int(os.getenv('DISPLAY_WIDTH', '800'))
+DISPLAY_HEIGHT = int(os.getenv('DISPLAY_HEIGHT', '480'))
+
+# Where frames go: 'inky' (the attached panel), 'png' (write DISPLAY_PNG_PATH),
+# 'memory' (keep the last frame) or 'null' (discard). Sinks other than 'inky'
+# render at DISPLAY_WIDTH x DISPLAY_HEIGHT and never load the Inky driver.
+DISPLAY_SINK = os.getenv('DISPLAY_SINK', 'inky')
+DISPLAY_PNG_PATH = os.getenv('DISPLAY_PNG_PATH', 'display_output.png')
+
+# Worker processes for batch renders with render_farm.py
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', str(os.cpu_count() or 1)))
+
+# Processed icons kept in memory between display updates (about 90 KB per
+# 152px icon, under 6 KB per 38px detail icon)
+ICON_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# Icons pre-rendered at startup into a memory-mapped atlas under ICON_ATLAS_DIR,
+# rebuilt automatically when icons/ or the enhancement settings change
+ICON_ATLAS_ENABLED = os.getenv('ICON_ATLAS_ENABLED', 'true').lower() == 'true'
+ICON_ATLAS_DIR = os.getenv('ICON_ATLAS_DIR', 'cache/render')
+ICON_ATLAS_SIZES = (152, 46, 38)  # Main icon, forecast cards, detail icons at 800x480
+
+# Dashboard geometry is scaled from the 800x480 design for each panel
+# resolution and saved as layout_<W>x<H>.json here ('' keeps it in memory only)
+LAYOUT_CACHE_DIR = os.getenv('LAYOUT_CACHE_DIR', 'cache/render')
+
+# Text measurements (label widths) remembered between frames
+TEXT_CACHE_MAX_ENTRIES = 1024
+
+# E-ink refresh policy: 'always', 'on_change' (any visible change) or
+# 'ignore_timestamp' (only refresh when more than the "last updated" clock changed)
+REFRESH_POLICY = os.getenv('REFRESH_POLICY', 'ignore_timestamp')
+# Refresh anyway once the panel has gone this long unchanged (0 = never)
+REFRESH_FORCE_AFTER_MINUTES = int(os.getenv('REFRESH_FORCE_AFTER_MINUTES', '180'))
+# Panel colour palette frames are quantized to: 'auto', 'impression' or 'spectra6'
+DISPLAY_PANEL = os.getenv('DISPLAY_PANEL', 'auto')
+# Dithering used to reduce frames to the panel palette: 'bayer' (ordered,
+# about 1.2-1.8x faster than the driver's own conversion), 'none' (nearest
+# colour, fastest, bands on gradients) or 'floyd' (error diffusion, the
+# smoothest and what the driver does with RGB frames, at the same cost as
+# the driver)
+DITHER_MODE = os.getenv('DITHER_MODE', 'bayer')
+# Optional per-panel (r, g, b) gamma applied after the contrast and colour
+# boost, e.g. {'spectra6': (1.0, 0.95, 1.1)}; panels not listed are left as-is
+PANEL_CALIBRATION = {}
 
 # Weather display settings
 SHOW_CURRENT_WEATHER = True
@@ -0,0 +1,63 @@
+"""
+Persistent cache of city coordinates for OpenWeatherMap lookups
+Lets coordinate-based endpoints start without waiting on a city-name query
+"""
+
+import json
+import os
+import threading
+
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_coordinate_cache(path):
+    """Return the process-wide cache for a file so instances don't overwrite each other"""
+    with _shared_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = _shared_caches[path] = CoordinateCache(path)
+        return cache
+
+
+class CoordinateCache:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """Read cached entries from disk, ignoring a missing or corrupt file"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(query):
+        return query.strip().lower()
+
+    def get(self, query):
+        """Return {'lat', 'lon', 'name', 'country'} for a city query, or None"""
+        return self._entries.get(self._key(query))
+
+    def set(self, query, lat, lon, name, country):
+        """Remember the coordinates for a city query and persist them"""
+        entry = {'lat': lat, 'lon': lon, 'name': name, 'country': country}
+        with self._lock:
+            self._entries[self._key(query)] = entry
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Write to a temp file first so a crash never leaves a truncated cache
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Warning: Could not save coordinate cache: {e}")
+        return entry
@@ -0,0 +1,86 @@
+"""
+Display sinks: where rendered frames are sent
+The Inky driver is only imported when the hardware sink is opened, so
+previews, CI and batch renders never probe I2C/SPI or touch GPIO
+"""
+
+import os
+
+DISPLAY_SINKS = ('inky', 'png', 'null', 'memory')
+
+
+class NullSink:
+    """Accepts frames and discards them"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.resolution = (width, height)
+        self.image = None
+
+    def set_image(self, image):
+        self.image = image
+
+    def show(self):
+        pass
+
+
+class MemorySink(NullSink):
+    """Keeps the last frame shown, for tests and batch renders"""
+
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        self.last_frame = None
+        self.frames_shown = 0
+
+    def show(self):
+        self.last_frame = self.image
+        self.frames_shown += 1
+
+
+class PNGSink(NullSink):
+    """Writes each frame shown to a PNG file, exactly as the panel would get it"""
+
+    def __init__(self, width, height, path):
+        super().__init__(width, height)
+        self.path = path
+
+    def show(self):
+        if self.image is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write then rename so a viewer never sees a half-written file
+        tmp_path = f"{self.path}.tmp"
+        self.image.save(tmp_path, format='PNG')
+        os.replace(tmp_path, self.path)
+
+
+def open_inky():
+    """Detect the attached Inky panel, importing the driver only now"""
+    from inky.auto import auto
+    return auto()
+
+
+def open_display(sink, width, height, path=None):
+    """Open a display sink by name
+
+    Args:
+        sink: 'inky' (the attached panel), 'png', 'null' or 'memory'
+        width, height: Frame size for the sinks without hardware
+        path: Output file for the 'png' sink
+
+    Returns:
+        An object with width, height, resolution, set_image() and show(),
+        like the Inky driver
+    """
+    if sink == 'inky':
+        return open_inky()
+    if sink == 'png':
+        return PNGSink(width, height, path)
+    if sink == 'memory':
+        return MemorySink(width, height)
+    if sink == 'null':
+        return NullSink(width, height)
+    raise ValueError(f"Unknown display sink {sink!r}, expected one of {', '.join(DISPLAY_SINKS)}")
@@ -0,0 +1,136 @@
+"""
+Process-wide font registry with a measured-text cache
+Resolves the Inter -> DejaVu -> default fallback once, loads each face and
+size on first use, and remembers text measurements between frames
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from PIL import ImageFont
+
+# Font families in order of preference, with the file used for each weight
+FONT_FAMILIES = (
+    ('Inter', {
+        'regular': '/usr/share/fonts/truetype/inter/Inter-Regular.ttf',
+        'medium': '/usr/share/fonts/truetype/inter/Inter-Medium.ttf',
+        'bold': '/usr/share/fonts/truetype/inter/Inter-Bold.ttf',
+    }),
+    ('DejaVu', {
+        'regular': '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+        'medium': '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+        'bold': '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    }),
+)
+
+_shared_registries = {}
+_shared_lock = threading.Lock()
+
+
+def get_font_registry(max_measurements):
+    """Return the process-wide font registry so every renderer shares loaded fonts"""
+    with _shared_lock:
+        registry = _shared_registries.get(max_measurements)
+        if registry is None:
+            registry = _shared_registries[max_measurements] = FontRegistry(max_measurements)
+        return registry
+
+
+class FontRegistry:
+    def __init__(self, max_measurements, families=FONT_FAMILIES):
+        """
+        Args:
+            max_measurements: Text measurements kept before the least recently
+                used are dropped
+            families: (name, {weight: path}) pairs in order of preference
+        """
+        self.max_measurements = max_measurements
+        self._families = list(families)
+        self._family = None
+        self._fonts = {}
+        self._measurements = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {'fonts_loaded': 0, 'hits': 0, 'misses': 0}
+
+    def _resolve_family(self):
+        """First family with every weight installed, or None for Pillow's default font"""
+        if self._family is None:
+            for name, paths in self._families:
+                if all(os.path.isfile(path) for path in paths.values()):
+                    self._family = (name, paths)
+                    break
+            else:
+                print("Warning: Could not load fonts, using default fonts")
+                self._family = (None, {})
+        return self._family
+
+    def font(self, weight, size):
+        """Shared font for a weight ('regular', 'medium' or 'bold') and pixel size"""
+        with self._lock:
+            font = self._fonts.get((weight, size))
+            if font is not None:
+                return font
+
+            name, paths = self._resolve_family()
+            if name is None:
+                font = ImageFont.load_default()
+            else:
+                try:
+                    font = ImageFont.truetype(paths[weight], size)
+                except OSError as e:
+                    # Unreadable file: fall back to the next family for every face
+                    print(f"Warning: Could not load {name} font {paths[weight]}: {e}")
+                    self._families = [family for family in self._families if family[0] != name]
+                    self._family = None
+                    self._fonts.clear()
+                    self._measurements.clear()
+                    return self.font(weight, size)
+
+            self._fonts[(weight, size)] = font
+            self.stats['fonts_loaded'] += 1
+            return font
+
+    def measure(self, font, text):
+        """Bounding box of text drawn at (0, 0), the same as ImageDraw.textbbox() on an RGB image"""
+        key = (font, text)
+        with self._lock:
+            bbox = self._measurements.get(key)
+            if bbox is not None:
+                self._measurements.move_to_end(key)
+                self.stats['hits'] += 1
+                return bbox
+            self.stats['misses'] += 1
+
+        bbox = font.getbbox(text, 'L')
+        with self._lock:
+            self._measurements[key] = bbox
+            if len(self._measurements) > self.max_measurements:
+                self._measurements.popitem(last=False)
+        return bbox
+
+    def text_width(self, font, text):
+        bbox = self.measure(font, text)
+        return bbox[2] - bbox[0]
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'fonts': len(self._fonts), 'measurements': len(self._measurements)}
+
+
+class RegisteredFont:
+    """Class attribute that resolves to a shared registry font when first read
+
+    Owners provide a `fonts` attribute holding their FontRegistry, and may
+    provide a `layout` whose scale() sizes the font for their panel.
+    """
+
+    def __init__(self, weight, size):
+        self.weight = weight
+        self.size = size
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        layout = getattr(instance, 'layout', None)
+        size = layout.scale(self.size) if layout is not None else self.size
+        return instance.fonts.font(self.weight, size)
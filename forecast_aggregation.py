@@ -0,0 +1,104 @@
+"""
+Vectorized daily aggregation of OpenWeatherMap 3-hourly forecasts
+Summarises a whole batch of locations in one pass with NumPy
+"""
+
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def _local_offsets(timestamps):
+    """UTC offsets of the system timezone, looked up once per distinct timestamp"""
+    unique, inverse = np.unique(timestamps, return_inverse=True)
+    offsets = np.array([time.localtime(int(ts)).tm_gmtoff for ts in unique], dtype=np.int64)
+    return offsets[inverse]
+
+
+def aggregate_daily_batch(forecasts, utc_offsets=None):
+    """Group forecast items by local date and summarise each day
+
+    Args:
+        forecasts: One forecast 'list' array per location, as returned by
+            the /forecast endpoint
+        utc_offsets: Optional UTC offset in seconds per location (the
+            response's city.timezone). None groups by the system's local
+            time, which is what WeatherAPI has always done.
+
+    Returns:
+        list: For each location, a list of day dicts in date order with the
+            same keys and values as WeatherAPI's daily forecast. When two
+            conditions are equally common, the one seen first that day wins.
+    """
+    counts_per_location = [len(items) for items in forecasts]
+    if not sum(counts_per_location):
+        return [[] for _ in forecasts]
+
+    items = [item for location_items in forecasts for item in location_items]
+    location = np.repeat(np.arange(len(forecasts)), counts_per_location)
+    timestamps = np.array([item['dt'] for item in items], dtype=np.int64)
+    temps = np.array([item['main']['temp'] for item in items], dtype=np.float64)
+    humidity = np.array([item['main']['humidity'] for item in items], dtype=np.float64)
+    wind = np.array([item['wind']['speed'] for item in items], dtype=np.float64)
+    descriptions = [item['weather'][0]['description'] for item in items]
+
+    if utc_offsets is None:
+        offsets = _local_offsets(timestamps)
+    else:
+        offsets = np.asarray(utc_offsets, dtype=np.int64)[location]
+    local_day = (timestamps + offsets) // SECONDS_PER_DAY
+
+    # One group per (location, local day), numbered in order of first appearance
+    day_span = int(local_day.max() - local_day.min()) + 1
+    keys = location * day_span + (local_day - local_day.min())
+    unique_keys, first_index, group = np.unique(keys, return_index=True, return_inverse=True)
+    group_count = len(unique_keys)
+    sizes = np.bincount(group, minlength=group_count)
+
+    min_temp = np.full(group_count, np.inf)
+    max_temp = np.full(group_count, -np.inf)
+    np.minimum.at(min_temp, group, temps)
+    np.maximum.at(max_temp, group, temps)
+
+    # bincount accumulates in item order, so the sums match Python's sum()
+    mean_humidity = np.bincount(group, weights=humidity, minlength=group_count) / sizes
+    mean_wind = np.bincount(group, weights=wind, minlength=group_count) / sizes
+
+    # Most common description per day, ties broken by earliest occurrence
+    condition_names, condition = np.unique(descriptions, return_inverse=True)
+    pair = group * len(condition_names) + condition
+    pair_count = np.bincount(pair, minlength=group_count * len(condition_names))
+    pair_first = np.full(group_count * len(condition_names), len(items), dtype=np.int64)
+    np.minimum.at(pair_first, pair, np.arange(len(items)))
+    score = pair_count * (len(items) + 1) - pair_first
+    most_common = score.reshape(group_count, len(condition_names)).argmax(axis=1)
+
+    results = [[] for _ in forecasts]
+    for g in np.argsort(first_index, kind='stable'):
+        first = first_index[g]
+        item = items[first]
+        if utc_offsets is None:
+            day = datetime.fromtimestamp(item['dt']).date()
+        else:
+            day = EPOCH_DATE + timedelta(days=int(local_day[first]))
+
+        results[location[first]].append({
+            'date': day,
+            'day_name': day.strftime('%a'),
+            'min_temp': round(float(min_temp[g])),
+            'max_temp': round(float(max_temp[g])),
+            'description': str(condition_names[most_common[g]]).title(),
+            'icon': item['weather'][0]['icon'],
+            'humidity': round(float(mean_humidity[g])),
+            'wind_speed': round(float(mean_wind[g]), 1)
+        })
+
+    return results
+
+
+def aggregate_daily(items, utc_offset=None):
+    """Summarise a single location's forecast list; see aggregate_daily_batch()"""
+    return aggregate_daily_batch([items], None if utc_offset is None else [utc_offset])[0]
@@ -0,0 +1,107 @@
+"""
+Skip e-ink refreshes that would not change what the panel shows
+Frames are reduced to the panel's colours before comparing, so changes the
+panel cannot display never trigger a slow full-screen refresh
+"""
+
+import hashlib
+import threading
+import time
+
+from panel_palette import quantize_to_panel
+
+REFRESH_POLICIES = ('always', 'on_change', 'ignore_timestamp')
+
+
+class RefreshGate:
+    """Decides whether a rendered frame is worth sending to the panel
+
+    Policies:
+        always:           refresh on every update
+        on_change:        refresh when any pixel of the quantized frame changes
+        ignore_timestamp: like on_change, but regions passed as ignore_boxes
+                          (the "last updated" clock) do not count
+    """
+
+    def __init__(self, panel, policy='ignore_timestamp', force_after_minutes=0, dither='floyd', palette=None):
+        if policy not in REFRESH_POLICIES:
+            raise ValueError(f"Unknown refresh policy {policy!r}, expected one of {', '.join(REFRESH_POLICIES)}")
+        self.panel = panel
+        self.policy = policy
+        self.dither = dither
+        self.palette = palette
+        self.force_after = force_after_minutes * 60
+        self._last_digest = None
+        self._last_refresh = None
+        self._lock = threading.Lock()
+        self.stats = {'refreshes': 0, 'skipped': 0, 'forced': 0}
+
+    def frame_digest(self, img, ignore_boxes=(), quantized=None):
+        """Hash of the frame as the panel would show it
+
+        quantized, if given, is img already converted by quantize_to_panel(),
+        so the frame is never quantized twice. With error diffusion, a change
+        spreads beyond its own pixels, so masking the quantized frame would
+        still let the clock leak into the hash. The RGB frame is hashed with
+        the ignored boxes blanked instead: quantizing is deterministic, so
+        the same input always gives the same panel image. Ordered and nearest
+        colour dithering are per pixel, so the quantized frame is masked.
+        """
+        if self.policy != 'ignore_timestamp':
+            ignore_boxes = ()
+
+        if ignore_boxes and self.dither == 'floyd':
+            frame = img.convert('RGB') if img.mode != 'RGB' else img.copy()
+            for box in ignore_boxes:
+                frame.paste((0, 0, 0), box)
+            return hashlib.sha1(frame.tobytes()).hexdigest()
+
+        frame = quantized
+        if frame is None:
+            frame = quantize_to_panel(img, self.panel, self.dither, self.palette)
+        if ignore_boxes:
+            frame = frame.copy()
+            for box in ignore_boxes:
+                frame.paste(0, box)
+        return hashlib.sha1(frame.tobytes()).hexdigest()
+
+    def should_refresh(self, img, ignore_boxes=(), quantized=None):
+        """Decide whether img should be shown
+
+        Nothing is remembered as shown yet: call mark_shown() with the
+        returned digest once the panel has actually been updated, so a failed
+        refresh is retried on the next update instead of being skipped.
+
+        Returns:
+            tuple: (refresh, digest)
+        """
+        with self._lock:
+            if self.policy == 'always':
+                return True, None
+
+            digest = self.frame_digest(img, ignore_boxes, quantized)
+            refresh = digest != self._last_digest
+            if not refresh and self.force_after and time.monotonic() - self._last_refresh >= self.force_after:
+                refresh = True
+                self.stats['forced'] += 1
+
+            if not refresh:
+                self.stats['skipped'] += 1
+            return refresh, digest
+
+    def mark_shown(self, digest):
+        """Record that the frame with this should_refresh() digest is on the panel"""
+        with self._lock:
+            self._last_digest = digest
+            self._last_refresh = time.monotonic()
+            self.stats['refreshes'] += 1
+
+    def reset(self):
+        """Forget the last frame so the next one is always shown"""
+        with self._lock:
+            self._last_digest = None
+            self._last_refresh = None
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,98 @@
+"""
+Pre-rasterised glyphs for the dashboard's numeric readouts
+FreeType renders each character of a font and size once; readouts are then
+assembled from the stored masks, pixel-identical to ImageDraw.text()
+"""
+
+import threading
+import numpy as np
+from PIL import Image
+
+# Characters of temperatures, percentages and ranges ("54°F", "-3", "100%", "54 / 46°")
+NUMERIC_CHARSET = '0123456789-°%/FC '
+
+_shared_atlases = {}
+_shared_lock = threading.Lock()
+
+
+def get_glyph_atlas(font, charset=NUMERIC_CHARSET):
+    """Return the process-wide atlas for a font, rasterising it on first use"""
+    with _shared_lock:
+        atlas = _shared_atlases.get((font, charset))
+        if atlas is None:
+            atlas = _shared_atlases[(font, charset)] = GlyphAtlas(font, charset)
+        return atlas
+
+
+class GlyphAtlas:
+    def __init__(self, font, charset=NUMERIC_CHARSET):
+        """
+        Args:
+            font: FreeType font (other fonts get an empty atlas and are never used)
+            charset: Characters to rasterise
+        """
+        self.font = font
+        self.charset = frozenset(charset) if hasattr(font, 'getmask2') else frozenset()
+        self._glyphs = {}
+        self._advances = {}
+        self._kerning = {}
+
+        for char in self.charset:
+            mask, offset = font.getmask2(char, 'L')
+            image = Image.Image()._new(mask)
+            pixels = np.asarray(image).reshape(image.height, image.width)
+            self._glyphs[char] = (image, pixels, offset)
+            # Advances in FreeType's 1/64 pixel units, exact for getlength()
+            self._advances[char] = round(font.getlength(char) * 64)
+
+        for first in self.charset:
+            for second in self.charset:
+                pair = round(font.getlength(first + second) * 64)
+                kerning = pair - self._advances[first] - self._advances[second]
+                if kerning:
+                    self._kerning[(first, second)] = kerning
+
+    def supports(self, text):
+        return bool(text) and self.charset.issuperset(text)
+
+    def draw(self, img, xy, text, fill):
+        """Draw text at integer xy like ImageDraw.Draw(img).text(xy, text, font, fill)
+
+        Glyphs sit at the pen position rounded to whole pixels, and
+        overlapping anti-aliased edges are combined with the same screen
+        blend FreeType rendering uses, so the output matches exactly.
+        """
+        x, y = xy
+        if len(text) == 1:
+            image, pixels, (offset_x, offset_y) = self._glyphs[text]
+            if pixels.size:
+                img.paste(fill, (x + offset_x, y + offset_y), image)
+            return
+
+        pen = 0
+        placed = []
+        for index, char in enumerate(text):
+            if index:
+                previous = text[index - 1]
+                pen += self._advances[previous] + self._kerning.get((previous, char), 0)
+            _, pixels, (offset_x, offset_y) = self._glyphs[char]
+            if pixels.size:
+                placed.append((((pen + 32) >> 6) + offset_x, offset_y, pixels))
+        if not placed:
+            return
+
+        left = min(gx for gx, _, _ in placed)
+        top = min(gy for _, gy, _ in placed)
+        right = max(gx + pixels.shape[1] for gx, _, pixels in placed)
+        bottom = max(gy + pixels.shape[0] for _, gy, pixels in placed)
+        mask = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for gx, gy, pixels in placed:
+            region = mask[gy - top:gy - top + pixels.shape[0], gx - left:gx - left + pixels.shape[1]]
+            if not region.any():
+                region[:] = pixels
+                continue
+            # a + b - a * b / 255, with the rounding of Pillow's MULDIV255
+            product = region.astype(np.int32) * pixels + 128
+            region[:] = region + pixels.astype(np.int32) - ((product + (product >> 8)) >> 8)
+
+        img.paste(fill, (x + left, y + top), Image.fromarray(mask, 'L'))
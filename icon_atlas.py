@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Prebuilt icon atlas
+Bakes the icon enhancement pipeline into one memory-mapped sprite file so startup
+doesn't decode and enhance every PNG before the first frame
+
+Run: python3 icon_atlas.py to (re)build cache/render/icon_atlas.rgba ahead of time
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from PIL import Image, ImageEnhance
+from image_ops import tint_icon
+
+ATLAS_VERSION = 1
+
+# UI icons are loaded by name and get the extra enhancement pass
+UI_ICONS = ('sunrise', 'sunset', 'wind', 'humidity', 'visibility', 'aqi')
+
+# Enhancement passes applied after resizing, in order: (ImageEnhance class, factor)
+ICON_ENHANCEMENT = {
+    'all': (
+        ('Sharpness', 1.5),   # Sharper edges for e-ink
+        ('Color', 1.8),       # 80% more saturated
+        ('Contrast', 1.5),    # 50% more contrast
+    ),
+    'ui': (
+        ('Brightness', 0.85), # 15% darker to deepen colors
+        ('Contrast', 2.0),    # Double contrast
+        ('Color', 2.2),       # More than double saturation
+    ),
+}
+
+# Icons recoloured after enhancement
+ICON_TINTS = {
+    'sunrise': (255, 220, 0),
+    'sunset': (255, 220, 0),
+}
+
+_shared_atlases = {}
+_shared_lock = threading.Lock()
+
+
+def process_icon(icon, name, size):
+    """Resize and enhance a source icon exactly as the display renders it
+
+    Args:
+        icon: Source image as opened from icons/
+        name: Icon file name without extension, which selects the UI pass and tint
+        size: Output width and height in pixels
+
+    Returns:
+        Image: Processed RGBA icon
+    """
+    if icon.mode != 'RGBA':
+        icon = icon.convert('RGBA')
+
+    # Use high-quality resize instead of thumbnail
+    icon = icon.resize((size, size), Image.Resampling.LANCZOS)
+
+    passes = ICON_ENHANCEMENT['all']
+    if name in UI_ICONS:
+        passes += ICON_ENHANCEMENT['ui']
+    for enhancer, factor in passes:
+        icon = getattr(ImageEnhance, enhancer)(icon).enhance(factor)
+
+    if name in ICON_TINTS:
+        icon = tint_icon(icon, ICON_TINTS[name])
+
+    return icon
+
+
+def _source_icons(icons_dir):
+    """Map icon name to (path, mtime_ns, file size) for every PNG in icons_dir"""
+    sources = {}
+    try:
+        names = sorted(os.listdir(icons_dir))
+    except OSError:
+        return sources
+    for filename in names:
+        if filename.endswith('.png'):
+            path = os.path.join(icons_dir, filename)
+            stat = os.stat(path)
+            sources[filename[:-4]] = (path, stat.st_mtime_ns, stat.st_size)
+    return sources
+
+
+def atlas_signature(sources, sizes):
+    """Hash of everything the atlas contents depend on"""
+    payload = json.dumps([
+        ATLAS_VERSION,
+        sorted(sizes),
+        {key: list(value) for key, value in ICON_ENHANCEMENT.items()},
+        ICON_TINTS,
+        UI_ICONS,
+        [(name, mtime, file_size) for name, (_, mtime, file_size) in sorted(sources.items())],
+    ])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def build_icon_atlas(icons_dir, directory, sizes):
+    """Render every icon at every size into directory/icon_atlas.rgba plus a JSON index
+
+    Icons are stored back to back as raw RGBA so each one can be mapped
+    without copying. Returns the index dict.
+    """
+    sources = _source_icons(icons_dir)
+    data_path = os.path.join(directory, 'icon_atlas.rgba')
+    index_path = os.path.join(directory, 'icon_atlas.json')
+    os.makedirs(directory, exist_ok=True)
+
+    entries = {}
+    offset = 0
+    tmp_data_path = f"{data_path}.{os.getpid()}.tmp"
+    with open(tmp_data_path, 'wb') as f:
+        for name, (path, mtime, _) in sorted(sources.items()):
+            with Image.open(path) as source:
+                source.load()
+                for size in sorted(set(sizes)):
+                    icon = process_icon(source, name, size)
+                    data = icon.tobytes()
+                    f.write(data)
+                    entries[f"{name}@{size}"] = {'offset': offset, 'size': size, 'mtime': mtime}
+                    offset += len(data)
+
+    index = {
+        'version': ATLAS_VERSION,
+        'signature': atlas_signature(sources, sizes),
+        'bytes': offset,
+        'entries': entries,
+    }
+    tmp_index_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    # Data first: a crash in between leaves an index whose signature forces a rebuild
+    os.replace(tmp_data_path, data_path)
+    os.replace(tmp_index_path, index_path)
+    return index
+
+
+class IconAtlas:
+    def __init__(self, icons_dir, directory, sizes):
+        """Open the atlas, rebuilding it first if icons or enhancement settings changed
+
+        Args:
+            icons_dir: Directory of source PNG icons
+            directory: Where the atlas and its index are stored
+            sizes: Icon sizes (pixels) to pre-render
+        """
+        self.icons_dir = icons_dir
+        self.directory = directory
+        self.sizes = tuple(sorted(set(sizes)))
+        self.entries = {}
+        self._map = None
+        self._images = {}
+        self._lock = threading.Lock()
+        self.rebuilt = False
+
+        try:
+            self._open()
+        except (OSError, ValueError) as e:
+            print(f"Warning: Icon atlas unavailable, icons will be processed on demand: {e}")
+
+    def _open(self):
+        data_path = os.path.join(self.directory, 'icon_atlas.rgba')
+        index_path = os.path.join(self.directory, 'icon_atlas.json')
+        signature = atlas_signature(_source_icons(self.icons_dir), self.sizes)
+
+        index = None
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('signature') != signature or os.path.getsize(data_path) != index.get('bytes'):
+                index = None
+        except (OSError, ValueError):
+            index = None
+
+        if index is None:
+            print("Building icon atlas...")
+            index = build_icon_atlas(self.icons_dir, self.directory, self.sizes)
+            self.rebuilt = True
+
+        if not index['bytes']:
+            return
+        with open(data_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.entries = index['entries']
+
+    def get(self, name, size, path):
+        """Return the pre-rendered icon, or None if it isn't in the atlas or its source changed
+
+        The image is a read-only view of the mapped atlas file.
+        """
+        entry = self.entries.get(f"{name}@{size}")
+        if entry is None:
+            return None
+        try:
+            if os.stat(path).st_mtime_ns != entry['mtime']:
+                return None
+        except OSError:
+            return None
+
+        key = (name, size)
+        with self._lock:
+            icon = self._images.get(key)
+            if icon is None:
+                start = entry['offset']
+                view = memoryview(self._map)[start:start + size * size * 4]
+                icon = Image.frombuffer('RGBA', (size, size), view, 'raw', 'RGBA', 0, 1)
+                self._images[key] = icon
+            return icon
+
+
+def get_icon_atlas(icons_dir, directory, sizes):
+    """Return the process-wide atlas so it's only checked and mapped once"""
+    key = (icons_dir, directory, tuple(sorted(set(sizes))))
+    with _shared_lock:
+        atlas = _shared_atlases.get(key)
+        if atlas is None:
+            atlas = _shared_atlases[key] = IconAtlas(icons_dir, directory, sizes)
+        return atlas
+
+
+def main():
+    from config import ICON_ATLAS_DIR, ICON_ATLAS_SIZES
+    import time
+
+    start = time.perf_counter()
+    index = build_icon_atlas('icons', ICON_ATLAS_DIR, ICON_ATLAS_SIZES)
+    elapsed = time.perf_counter() - start
+    print(f"Built {len(index['entries'])} icons at sizes {sorted(set(ICON_ATLAS_SIZES))} "
+          f"({index['bytes'] / 1024:.0f} KB) in {elapsed:.2f}s -> {ICON_ATLAS_DIR}/icon_atlas.rgba")
+
+if __name__ == "__main__":
+    main()
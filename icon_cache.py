@@ -0,0 +1,93 @@
+"""
+In-memory LRU cache of processed weather and UI icons
+Keeps resized and enhanced icons between frames so steady-state updates skip PNG decoding
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_icon_cache(max_bytes):
+    """Return the process-wide icon cache so every renderer shares processed icons"""
+    with _shared_lock:
+        cache = _shared_caches.get(max_bytes)
+        if cache is None:
+            cache = _shared_caches[max_bytes] = IconCache(max_bytes)
+        return cache
+
+
+def _image_bytes(image):
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+class IconCache:
+    def __init__(self, max_bytes):
+        """
+        Args:
+            max_bytes: Total decoded image size above which the least recently
+                used icons are dropped
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self, key, path):
+        """Return the cached image for key, or None if missing or its source file changed
+
+        The returned image is shared between callers and must not be modified.
+        """
+        mtime = self._mtime(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                image, cached_mtime, size = entry
+                if cached_mtime == mtime:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return image
+                # The icon file was replaced or removed since it was processed
+                del self._entries[key]
+                self.bytes -= size
+                self.stats['invalidations'] += 1
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key, path, image):
+        """Store a processed image, evicting the least recently used icons if over max_bytes"""
+        size = _image_bytes(image)
+        if size > self.max_bytes:
+            return
+        mtime = self._mtime(path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._entries[key] = (image, mtime, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'entries': len(self._entries), 'bytes': self.bytes}
@@ -0,0 +1,139 @@
+"""
+Vectorized image operations for the dashboard renderer
+NumPy replacements for per-pixel Python loops
+"""
+
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw
+
+# RGBA pixels viewed as one little-endian integer each: R is the low byte, A the high byte
+_PIXEL = np.dtype('<u4')
+_ALPHA_MASK = 0xFF000000
+
+
+@lru_cache(maxsize=16)
+def _tint_lut(color):
+    """Packed RGB lookup table indexed by r + g + b (0-765)
+
+    Values are computed with the same float expression as the original
+    per-pixel loop, so results are bit-identical.
+    """
+    lut = np.empty(766, dtype=_PIXEL)
+    for total in range(766):
+        brightness = total / 3 / 255
+        r, g, b = (int(channel * brightness) for channel in color)
+        lut[total] = r | g << 8 | b << 16
+    lut.setflags(write=False)
+    return lut
+
+
+def tint_icon(icon, color):
+    """Recolour an icon to a single colour, keeping each pixel's brightness and alpha
+
+    Fully transparent pixels are left untouched.
+
+    Args:
+        icon: PIL image (converted to RGBA if needed)
+        color: (r, g, b) target colour at full brightness
+
+    Returns:
+        Image: New RGBA image
+    """
+    if icon.mode != 'RGBA':
+        icon = icon.convert('RGBA')
+
+    pixels = np.asarray(icon)
+    brightness = pixels[..., 0].astype(np.uint16)
+    brightness += pixels[..., 1]
+    brightness += pixels[..., 2]
+
+    packed = pixels.view(_PIXEL)[..., 0]
+    alpha = packed & _ALPHA_MASK
+    tinted = _tint_lut(tuple(color)).take(brightness) | alpha
+    tinted = np.where(alpha != 0, tinted, packed)
+    return Image.frombuffer('RGBA', icon.size, tinted, 'raw', 'RGBA', 0, 1)
+
+
+@lru_cache(maxsize=8)
+def _gradient_ramp(height, max_alpha, steps):
+    """Alpha by depth below the curve for a fill made of `steps` stacked bands
+
+    Depth d gets the alpha of the deepest band whose offset int(height * n / steps)
+    is at most d, which is what drawing the bands as shifted polygons on top
+    of each other produced.
+    """
+    ramp = np.empty(height + 1, dtype=np.uint8)
+    band = 0
+    for depth in range(height + 1):
+        while band + 1 < steps and int((height * (band + 1)) / steps) <= depth:
+            band += 1
+        ramp[depth] = int(max_alpha * (1 - band / steps))
+    ramp.setflags(write=False)
+    return ramp
+
+
+def gradient_area_fill(img, curve, baseline, color, height, max_alpha=80, steps=30):
+    """Fill the area between a curve and a horizontal baseline with a fading colour
+
+    Opacity starts at max_alpha along the curve and steps down over `height`
+    pixels in `steps` bands. This matches stacking `steps` shifted polygons,
+    including the faint last band that covers the baseline and hangs below
+    it, but only the curve's bounding box is rasterised and composited, once.
+
+    Args:
+        img: RGB image drawn on in place
+        curve: [(x, y), ...] points of the curve, left to right
+        baseline: y coordinate the area is closed at
+        color: (r, g, b) fill colour
+        height: Pixels over which the fill fades out
+    """
+    last_offset = int((height * (steps - 1)) / steps)
+    edge = [(curve[-1][0], baseline), (curve[0][0], baseline)]
+    polygon = list(curve) + edge
+    last_band = [(x, y + last_offset) for x, y in curve] + edge
+
+    xs = [x for x, _ in polygon]
+    ys = [y for _, y in polygon + last_band]
+    left, top = max(int(min(xs)), 0), max(int(min(ys)), 0)
+    right, bottom = min(int(max(xs)) + 1, img.width), min(int(max(ys)) + 1, img.height)
+    if right <= left or bottom <= top:
+        return
+
+    size = (right - left, bottom - top)
+    area = Image.new('L', size, 0)
+    ImageDraw.Draw(area).polygon([(x - left, y - top) for x, y in polygon], fill=255)
+    band = Image.new('L', size, 0)
+    ImageDraw.Draw(band).polygon([(x - left, y - top) for x, y in last_band], fill=255)
+    inside = np.asarray(area) > 0
+
+    # Depth of every pixel below the first filled pixel of its column
+    column_top = inside.argmax(axis=0)
+    depth = np.arange(size[1])[:, None] - column_top[None, :]
+    ramp = _gradient_ramp(height, max_alpha, steps)
+    alpha = ramp[np.clip(depth, 0, height)]
+    alpha[~inside] = 0
+    # The last band was drawn over everything else
+    alpha[np.asarray(band) > 0] = ramp[-1]
+
+    img.paste(color, (left, top, right, bottom), Image.fromarray(alpha, 'L'))
+
+
+@lru_cache(maxsize=8)
+def vertical_gradient(size, top_color, bottom_color):
+    """Background plate fading from top_color to bottom_color, cached per size and palette
+
+    Rows are interpolated exactly like drawing one line per scanline did.
+    The cached image is shared: copy() it before drawing on it.
+
+    Args:
+        size: (width, height)
+        top_color, bottom_color: (r, g, b) tuples
+    """
+    width, height = size
+    factor = (np.arange(height) / height)[:, None]
+    top = np.array(top_color, dtype=np.float64)
+    bottom = np.array(bottom_color, dtype=np.float64)
+    rows = (top * (1 - factor) + bottom * factor).astype(np.uint8)
+    pixels = np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3)))
+    return Image.fromarray(pixels, 'RGB')
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Resolution-independent dashboard layout
+Scales the 800x480 design to each panel's resolution once and caches the
+geometry per resolution, in memory and optionally as JSON on disk, so every
+panel renders natively in one pass with no resize step
+
+Run: python3 layout.py to precompute the layouts of the Impression panels
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+# Bump when the scaling rules change, so layouts saved on disk are recomputed
+LAYOUT_VERSION = 1
+
+# The design every layout is scaled from (7.3" Impression)
+REFERENCE_SIZE = (800, 480)
+
+# Impression 5.7", 4", 7.3" and 13.3"
+PANEL_SIZES = ((600, 448), (640, 400), (800, 480), (1600, 1200))
+
+_shared_layouts = {}
+_shared_lock = threading.Lock()
+
+
+def _scaled(value, factor):
+    """Reference pixels to whole panel pixels, never below 1"""
+    return max(1, int(value * factor + 0.5))
+
+
+def compute_layout(width, height):
+    """Geometry of every dashboard section for a width x height panel
+
+    Section positions scale with the panel's width (x) and height (y), so
+    the sections keep their place on any aspect ratio. Fonts, icons, strokes
+    and offsets within a section scale uniformly with the smaller of the
+    two, so nothing is stretched or overflows. At 800x480 every value is the
+    reference design's.
+
+    Returns:
+        dict: JSON-serialisable geometry, in whole pixels
+    """
+    reference_width, reference_height = REFERENCE_SIZE
+    scale_x = width / reference_width
+    scale_y = height / reference_height
+    scale = min(scale_x, scale_y)
+
+    def x(value):
+        return _scaled(value, scale_x)
+
+    def y(value):
+        return _scaled(value, scale_y)
+
+    def s(value):
+        return _scaled(value, scale)
+
+    current_y = y(100)
+    card_height = y(90)
+    # Card contents keep their size and are centred in a taller or shorter card
+    card_pad = (card_height - s(90)) // 2
+
+    return {
+        'size': [width, height],
+        'scale': scale,
+        'header': {
+            'location_y': y(22),
+            'date_dy': s(36),
+            'timestamp_margin': x(80),
+        },
+        'current': {
+            'icon_x': x(60),
+            'icon_y': current_y - s(18),
+            'icon_size': s(152),
+            'temp_x': x(232),
+            'temp_y': current_y,
+            'unit_gap': s(2),
+            'description_dy': s(94),
+            'feels_dy': s(116),
+        },
+        'details': {
+            'columns': [x(430), x(590)],
+            'y': y(90),
+            'row_spacing': y(50),
+            'icon_size': s(38),
+            'text_dx': s(44),
+            'label_dy': s(4),
+            'value_dy': s(20),
+        },
+        'graph': {
+            'x': x(85),
+            'y': y(257),
+            'width': x(590),
+            'height': y(80),
+            'temp_label_x': x(42),
+            'max_label_dy': s(5),
+            'min_label_dy': s(8),
+            'rain_label_dx': s(8),
+            'time_label_dy': s(10),
+            'temp_line_width': s(3),
+            'rain_line_width': s(2),
+        },
+        'forecast': {
+            'y': y(370),
+            'left': x(42),
+            'margin': x(58),
+            'gap': x(3),
+            'height': card_height,
+            'radius': s(8),
+            'border_width': s(2),
+            'day_dy': card_pad + s(6),
+            'icon_size': s(46),
+            'icon_dy': card_pad + s(25),
+            'temp_dy': card_pad + s(73),
+        },
+    }
+
+
+def layout_signature():
+    """Hash of the rules and reference design saved layouts were computed from"""
+    payload = json.dumps([LAYOUT_VERSION, compute_layout(*REFERENCE_SIZE)])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _load_geometry(width, height, directory):
+    """Saved geometry for this resolution if still current, else compute and save it"""
+    if not directory:
+        return compute_layout(width, height)
+
+    path = os.path.join(directory, f"layout_{width}x{height}.json")
+    signature = layout_signature()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('signature') == signature and saved['geometry']['size'] == [width, height]:
+            return saved['geometry']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    geometry = compute_layout(width, height)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': signature, 'geometry': geometry}, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not save layout {path}: {e}")
+    return geometry
+
+
+def get_layout(width, height, directory=None):
+    """Return the process-wide layout for a panel resolution
+
+    Args:
+        width, height: Panel resolution
+        directory: Where layout_<W>x<H>.json files are kept; None keeps
+            layouts in memory only. A saved file is used as-is until the
+            design or scaling rules change, so one panel can be fine-tuned
+            by editing its file.
+    """
+    key = (width, height, directory)
+    with _shared_lock:
+        layout = _shared_layouts.get(key)
+        if layout is None:
+            layout = _shared_layouts[key] = Layout(_load_geometry(width, height, directory))
+        return layout
+
+
+class Layout:
+    """Geometry for one panel resolution, read as layout['graph']['x'] and so on"""
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+        self.width, self.height = geometry['size']
+        self.name = f"{self.width}x{self.height}"
+
+    def __getitem__(self, section):
+        return self.geometry[section]
+
+    def scale(self, value):
+        """A reference font, icon or stroke size at this panel's scale"""
+        return _scaled(value, self.geometry['scale'])
+
+
+def main():
+    from config import LAYOUT_CACHE_DIR
+
+    for width, height in PANEL_SIZES:
+        layout = get_layout(width, height, LAYOUT_CACHE_DIR or None)
+        print(f"{layout.name}: scale {layout['scale']:.3f}, graph {layout['graph']['width']}x"
+              f"{layout['graph']['height']}, main icon {layout['current']['icon_size']}px")
+    if LAYOUT_CACHE_DIR:
+        print(f"Layouts saved to {LAYOUT_CACHE_DIR}/")
+
+if __name__ == "__main__":
+    main()
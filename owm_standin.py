@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Local OpenWeatherMap stand-in server
+Serves recorded API payloads so WeatherAPI can be exercised and benchmarked offline
+
+Run: python3 owm_standin.py --port 8080 --latency 0.2
+Then point the dashboard at it:
+    OWM_BASE_URL=http://127.0.0.1:8080/data/2.5
+    OWM_ONECALL_URL=http://127.0.0.1:8080/data/3.0
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'owm')
+
+# Routes served, keyed by the last path component of the request
+ROUTES = ('weather', 'forecast', 'uvi', 'air_pollution', 'onecall')
+
+# Timestamp fields shifted when rebasing recorded payloads to the current time
+TIME_FIELDS = ('dt', 'date', 'sunrise', 'sunset', 'moonrise', 'moonset')
+
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """Load one recorded JSON payload per route"""
+    fixtures = {}
+    for route in ROUTES:
+        path = os.path.join(directory, f"{route}.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                fixtures[route] = json.load(f)
+    return fixtures
+
+
+def shift_timestamps(payload, delta):
+    """Return a copy of a payload with every timestamp field moved by delta seconds"""
+    if isinstance(payload, dict):
+        return {
+            key: value + delta if key in TIME_FIELDS and isinstance(value, int) and value > 0
+            else shift_timestamps(value, delta)
+            for key, value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [shift_timestamps(value, delta) for value in payload]
+    return payload
+
+
+class StandInServer:
+    """OpenWeatherMap stand-in with configurable latency, errors and throttling"""
+
+    def __init__(self, host='127.0.0.1', port=0, fixtures_dir=FIXTURES_DIR, latency=0.0,
+                 jitter=0.0, error_rate=0.0, calls_per_minute=None, rebase_time=True):
+        """
+        Args:
+            port: Port to listen on (0 picks a free port)
+            latency: Seconds added to every response
+            jitter: Extra random latency of up to this many seconds
+            error_rate: Fraction of requests answered with HTTP 500
+            calls_per_minute: Answer HTTP 429 once this many calls were made in
+                the last 60 seconds (None disables throttling)
+            rebase_time: Shift recorded timestamps so the data looks current
+        """
+        self.fixtures = load_fixtures(fixtures_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls_per_minute = calls_per_minute
+        self.rebase_time = rebase_time
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0, 'not_found': 0, 'disconnected': 0}
+        self._recent_calls = deque()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Recorded payloads share the current weather's observation time as their origin
+        self._recorded_at = self.fixtures.get('weather', {}).get('dt')
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections alive so client pooling can be measured
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; don't let Nagle delay the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, payload = server.respond(self.path)
+                body = json.dumps(payload).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out or was cancelled before the reply went out
+                    server._count('disconnected')
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _throttled(self):
+        if not self.calls_per_minute:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            while self._recent_calls and now - self._recent_calls[0] > 60:
+                self._recent_calls.popleft()
+            if len(self._recent_calls) >= self.calls_per_minute:
+                return True
+            self._recent_calls.append(now)
+            return False
+
+    def respond(self, path):
+        """Return (status, payload) for a request path"""
+        self._count('requests')
+        url = urlparse(path)
+        route = url.path.rstrip('/').rsplit('/', 1)[-1]
+        params = parse_qs(url.query)
+
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        if self._throttled():
+            self._count('throttled')
+            return 429, {'cod': 429, 'message': 'Your account is temporary blocked due to exceeding of requests limitation'}
+        if self.error_rate and random.random() < self.error_rate:
+            self._count('errors')
+            return 500, {'cod': 500, 'message': 'Internal error'}
+        if 'appid' not in params:
+            return 401, {'cod': 401, 'message': 'Invalid API key'}
+        if route not in self.fixtures:
+            self._count('not_found')
+            return 404, {'cod': '404', 'message': f"Unknown route {url.path}"}
+
+        payload = self.fixtures[route]
+        if self.rebase_time and self._recorded_at:
+            payload = shift_timestamps(payload, int(time.time()) - self._recorded_at)
+        return 200, payload
+
+    def start(self):
+        """Serve in a background thread; returns self for chaining"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenWeatherMap stand-in server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="Directory of recorded <route>.json payloads")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Random extra latency up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests failing with HTTP 500")
+    parser.add_argument('--calls-per-minute', type=int, default=None, help="Answer HTTP 429 above this rate")
+    parser.add_argument('--no-rebase', action='store_true', help="Serve recorded timestamps unchanged")
+    args = parser.parse_args()
+
+    server = StandInServer(args.host, args.port, args.fixtures, args.latency, args.jitter,
+                           args.error_rate, args.calls_per_minute, not args.no_rebase)
+
+    print(f"OpenWeatherMap stand-in serving {', '.join(sorted(server.fixtures))} on {server.url}")
+    print("Point the dashboard at it with:")
+    print(f"  OWM_BASE_URL={server.url}/data/2.5")
+    print(f"  OWM_ONECALL_URL={server.url}/data/3.0")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped. Stats: {server.stats}")
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Colour palettes of the supported Inky e-ink panels
+Maps each colour a panel can show to its RGB value and the driver's colour
+code, and converts rendered frames to palette images the driver shows as-is
+"""
+
+from functools import lru_cache
+import numpy as np
+from PIL import Image
+
+# (display colour code, nominal RGB) for every colour a panel can show. The
+# Inky drivers quantize against a blend of these and the panel's measured
+# colours instead (see driver_palette()); these are used without a driver.
+PANEL_PALETTES = {
+    # Inky Impression 4", 5.7" and 7.3" (7 colour)
+    'impression': (
+        (0, (0, 0, 0)),        # Black
+        (1, (255, 255, 255)),  # White
+        (2, (0, 255, 0)),      # Green
+        (3, (0, 0, 255)),      # Blue
+        (4, (255, 0, 0)),      # Red
+        (5, (255, 255, 0)),    # Yellow
+        (6, (255, 140, 0)),    # Orange
+    ),
+    # Inky Impression Spectra 6 panels (7.3" and 13.3"); code 4 is unused
+    'spectra6': (
+        (0, (0, 0, 0)),        # Black
+        (1, (255, 255, 255)),  # White
+        (2, (255, 255, 0)),    # Yellow
+        (3, (255, 0, 0)),      # Red
+        (5, (0, 0, 255)),      # Blue
+        (6, (0, 255, 0)),      # Green
+    ),
+}
+
+# Driver classes with Spectra 6 panels
+SPECTRA6_DRIVERS = ('InkyE673', 'InkyEL133UF1')
+
+# Palette saturation the drivers' set_image() uses by default
+DRIVER_SATURATION = 0.5
+
+DITHER_MODES = ('none', 'bayer', 'floyd')
+
+# Bits kept per channel when looking up the nearest panel colour (32x32x32 table)
+LUT_BITS = 5
+# Range of the ordered dither offsets; roughly the gap between palette colours
+BAYER_SPREAD = 128
+
+
+def detect_panel(display, setting='auto'):
+    """Return the PANEL_PALETTES key for a display object
+
+    Args:
+        display: Inky display instance (or any stand-in)
+        setting: 'auto' to pick from the driver class, or a PANEL_PALETTES key
+    """
+    if setting != 'auto':
+        if setting not in PANEL_PALETTES:
+            raise ValueError(f"Unknown panel {setting!r}, expected one of {', '.join(PANEL_PALETTES)}")
+        return setting
+    if type(display).__name__ in SPECTRA6_DRIVERS:
+        return 'spectra6'
+    return 'impression'
+
+
+def driver_palette(display, saturation=DRIVER_SATURATION):
+    """Flat RGB palette the Inky driver quantizes RGB frames against, or None
+
+    The drivers blend the panel's measured colours with the nominal ones by
+    saturation, index by colour code. Sinks without a driver return None.
+    """
+    blend = getattr(display, '_palette_blend', None)
+    if blend is None:
+        return None
+    return tuple(int(value) for value in blend(saturation))
+
+
+def panel_colors(panel, palette=None):
+    """(display code, RGB) pairs for a panel, from a driver_palette() if given"""
+    if palette is None:
+        return PANEL_PALETTES[panel]
+    return tuple((code, tuple(palette[code * 3:code * 3 + 3]) if len(palette) >= code * 3 + 3 else rgb)
+                 for code, rgb in PANEL_PALETTES[panel])
+
+
+def palette_image(panel, palette=None):
+    """'P' image to quantize against: the driver's palette as its set_image() builds
+    it, or the panel's nominal colours stored at their display codes
+
+    Cached, so the image is shared and must not be modified.
+    """
+    return _palette_image(panel, palette)
+
+
+@lru_cache(maxsize=4)
+def _palette_image(panel, palette):
+    image = Image.new('P', (1, 1))
+    if palette is not None:
+        # Padded with black exactly like the driver, so indices match its own
+        image.putpalette(list(palette) + [0, 0, 0] * 248)
+    else:
+        # Quantized indices are then display codes with no remapping. Unused
+        # codes repeat black, which sits at code 0 and so wins every tie.
+        colors = PANEL_PALETTES[panel]
+        flat = [0, 0, 0] * (max(code for code, _ in colors) + 1)
+        for code, rgb in colors:
+            flat[code * 3:code * 3 + 3] = rgb
+        image.putpalette(flat)
+    image.load()
+    return image
+
+
+@lru_cache(maxsize=4)
+def _code_palette(colors):
+    """Flat 256-entry palette with each colour stored at its display code"""
+    palette = [0] * 768
+    for code, rgb in colors:
+        palette[code * 3:code * 3 + 3] = rgb
+    return palette
+
+
+def _nearest_codes(colors, offset=0):
+    """Display code of the nearest panel colour for every cell of the RGB table
+
+    Each cell stands for its centre plus offset, so an ordered dither offset
+    can be folded into the table instead of being added to every pixel.
+    """
+    shift = 8 - LUT_BITS
+    levels = np.clip((np.arange(1 << LUT_BITS) << shift) + (1 << shift >> 1) + offset, 0, 255)
+    best = np.full((1 << LUT_BITS,) * 3, np.inf)
+    codes = np.zeros((1 << LUT_BITS,) * 3, dtype=np.uint8)
+    for code, (r, g, b) in colors:
+        distance = ((levels - r) ** 2.0)[:, None, None] + ((levels - g) ** 2.0)[None, :, None] + ((levels - b) ** 2.0)[None, None, :]
+        closer = distance < best
+        best[closer] = distance[closer]
+        codes[closer] = code
+    return codes.ravel()
+
+
+@lru_cache(maxsize=4)
+def _color_lut(colors):
+    """Nearest-colour table indexed by (r >> s) << 2*LUT_BITS | (g >> s) << LUT_BITS | (b >> s)"""
+    lut = _nearest_codes(colors)
+    lut.setflags(write=False)
+    return lut
+
+
+@lru_cache(maxsize=1)
+def _bayer_offsets():
+    """4x4 ordered dither offsets centred on zero, spanning BAYER_SPREAD"""
+    matrix = np.array([[0, 8, 2, 10], [12, 4, 14, 6], [3, 11, 1, 9], [15, 7, 13, 5]])
+    return ((matrix + 0.5) / matrix.size - 0.5) * BAYER_SPREAD
+
+
+@lru_cache(maxsize=4)
+def _bayer_lut(colors):
+    """One colour table per position in the 4x4 Bayer matrix, stored one after another"""
+    lut = np.concatenate([_nearest_codes(colors, offset) for offset in _bayer_offsets().ravel()])
+    lut.setflags(write=False)
+    return lut
+
+
+@lru_cache(maxsize=4)
+def _bayer_index(width, height):
+    """Start of each pixel's Bayer colour table within _bayer_lut()"""
+    positions = np.arange(16, dtype=np.uint32).reshape(4, 4) << (3 * LUT_BITS)
+    index = np.tile(positions, (height // 4 + 1, width // 4 + 1))[:height, :width]
+    index = np.ascontiguousarray(index)
+    index.setflags(write=False)
+    return index
+
+
+@lru_cache(maxsize=2)
+def _channel_tables(dtype):
+    """Each channel's share of the colour table index, by channel value"""
+    cells = np.arange(256) >> (8 - LUT_BITS)
+    tables = tuple((cells << shift).astype(dtype) for shift in (2 * LUT_BITS, LUT_BITS, 0))
+    for table in tables:
+        table.setflags(write=False)
+    return tables
+
+
+def _table_index(pixels, dtype):
+    """Colour table cell of every pixel in a (height, width, 3) uint8 array"""
+    red, green, blue = _channel_tables(dtype)
+    index = red.take(pixels[..., 0])
+    index |= green.take(pixels[..., 1])
+    index |= blue.take(pixels[..., 2])
+    return index
+
+
+def quantize_to_panel(img, panel, dither='floyd', palette=None):
+    """Convert an RGB frame to a 'P' image of display colour codes
+
+    The driver shows 'P' images without converting them again, so the
+    dithering chosen here is what appears on the panel.
+
+    Args:
+        img: Rendered frame
+        panel: PANEL_PALETTES key
+        dither: 'none' (nearest colour), 'bayer' (4x4 ordered) or
+            'floyd' (Floyd-Steinberg error diffusion, as the driver does)
+        palette: The driver_palette() of the attached panel. With it, 'floyd'
+            runs the same conversion as the driver's set_image() does on an
+            RGB frame, so the panel shows exactly what it did when handed
+            RGB. Without it the nominal PANEL_PALETTES colours are used.
+
+    Returns:
+        Image: 'P' image whose indices are display colour codes
+    """
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    if dither == 'floyd':
+        # Error diffusion is serial per pixel, so Pillow's C loop beats any
+        # NumPy formulation. Both palettes are indexed by colour code, so
+        # the result goes to the driver as-is.
+        return img.quantize(palette=palette_image(panel, palette), dither=Image.Dither.FLOYDSTEINBERG)
+
+    colors = panel_colors(panel, palette)
+    if dither == 'bayer':
+        index = _table_index(np.asarray(img), np.dtype(np.uint32))
+        index |= _bayer_index(img.width, img.height)
+        codes = _bayer_lut(colors).take(index)
+    elif dither == 'none':
+        codes = _color_lut(colors).take(_table_index(np.asarray(img), np.dtype(np.uint16)))
+    else:
+        raise ValueError(f"Unknown dither mode {dither!r}, expected one of {', '.join(DITHER_MODES)}")
+
+    result = Image.fromarray(codes, 'P')
+    result.putpalette(_code_palette(colors))
+    return result
@@ -4,48 +4,16 @@ Preview the weather dashboard display without Inky hardware
 This creates a PNG file that you can view on your computer
 """
 
-import sys
-from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime, timedelta
-
-class MockInkyDisplay:
-    """Mock display object that simulates Inky Impression"""
-    def __init__(self):
-        self.width = 800
-        self.height = 480
-        self.resolution = f"{self.width}x{self.height}"
-
-    def set_image(self, img):
-        self.image = img
-
-    def show(self):
-        # Don't actually show on hardware, just save
-        pass
-
-def mock_auto():
-    """Replace the auto() function to return mock display"""
-    return MockInkyDisplay()
-
-# Create a mock inky module before importing weather_display
-from types import SimpleNamespace
-
-# Create mock modules
-inky_auto_module = SimpleNamespace(auto=mock_auto)
-inky_module = SimpleNamespace(auto=inky_auto_module)
-
-# Add mock to sys.modules before importing weather_display
-sys.modules['inky'] = inky_module
-sys.modules['inky.auto'] = inky_auto_module
-
-# Now we can import weather_display
+from display_sinks import open_display
 from weather_display import WeatherDisplay
 
 def generate_preview():
     """Generate a preview of the weather display"""
     print("Generating weather dashboard preview...")
 
-    # Create display instance
-    display = WeatherDisplay()
+    # Create display instance without Inky hardware; update_display saves the PNG
+    display = WeatherDisplay(display=open_display('null', 800, 480))
 
     # Create sample weather data
     sample_data = {
@@ -0,0 +1,149 @@
+"""
+Rate limiter for the OpenWeatherMap call quota
+Shared by every WeatherAPI instance in a batch so the fleet stays under the limit
+"""
+
+import threading
+import time
+from collections import deque
+import requests
+
+
+class QuotaExceeded(requests.exceptions.RequestException):
+    """Raised when no call can be made within the allowed wait time"""
+
+
+class TokenBucket:
+    def __init__(self, capacity, refill_per_second):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated = now
+
+    def seconds_until_available(self):
+        """Seconds until one whole token is available (0 if one already is)"""
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.refill_per_second
+
+
+class RollingWindow:
+    """Allows at most limit calls in any window of the given length
+
+    Unlike a token bucket it has no starting burst, so a fresh limiter can't
+    spend a full budget and then its refill within the same window.
+    """
+
+    def __init__(self, limit, seconds):
+        self.limit = limit
+        self.seconds = seconds
+        self.calls = deque()
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        while self.calls and self.calls[0] + self.seconds <= now:
+            self.calls.popleft()
+        self.updated = now
+
+    @property
+    def tokens(self):
+        return self.limit - len(self.calls)
+
+    def take(self):
+        self.calls.append(self.updated)
+
+    def seconds_until_available(self):
+        """Seconds until the oldest call in the window expires (0 if a call is free now)"""
+        if len(self.calls) < self.limit:
+            return 0.0
+        return self.calls[0] + self.seconds - self.updated
+
+
+class RateLimiter:
+    """Limits calls to both a per-minute and a per-day budget"""
+
+    def __init__(self, calls_per_minute, calls_per_day):
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_day = calls_per_day
+        self._minute = TokenBucket(calls_per_minute, calls_per_minute / 60)
+        # The daily quota must hold over any 24 hours, so it gets no burst on top
+        self._day = RollingWindow(calls_per_day, 86400)
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'waits': 0, 'waited_seconds': 0.0, 'rejected': 0, 'throttled': 0}
+
+    def acquire(self, max_wait=None):
+        """Take one call from the quota, sleeping until one is available
+
+        Args:
+            max_wait: Give up after this many seconds of waiting (None waits forever)
+
+        Raises:
+            QuotaExceeded: If no call frees up within max_wait
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(max_wait, waited)
+            if not wait:
+                return
+            time.sleep(wait)
+            waited += wait
+
+    def try_acquire(self, max_wait=None, waited=0.0):
+        """Take one call if one is available now, without sleeping
+
+        Lets callers that can't block (an event loop) wait in their own way
+        and try again.
+
+        Args:
+            max_wait: Give up once waited plus the wait needed exceeds this
+            waited: Seconds the caller has already waited for this call
+
+        Returns:
+            float: 0 if the call was taken, else seconds to wait before trying again
+
+        Raises:
+            QuotaExceeded: If no call frees up within max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._minute.refill(now)
+            self._day.refill(now)
+
+            wait = max(self._minute.seconds_until_available(), self._day.seconds_until_available())
+            if wait == 0:
+                self._minute.tokens -= 1
+                self._day.take()
+                self.stats['calls'] += 1
+                if waited:
+                    self.stats['waits'] += 1
+                    self.stats['waited_seconds'] += waited
+                return 0.0
+
+            if max_wait is not None and waited + wait > max_wait:
+                self.stats['rejected'] += 1
+                raise QuotaExceeded(f"OpenWeatherMap quota exhausted (next call in {wait:.0f}s)")
+            return wait
+
+    def record_throttled(self):
+        """Count a 429 response from the API"""
+        with self._lock:
+            self.stats['throttled'] += 1
+
+    def get_stats(self):
+        """Return usage counters and the calls currently left in each budget"""
+        with self._lock:
+            now = time.monotonic()
+            self._minute.refill(now)
+            self._day.refill(now)
+            return {
+                **self.stats,
+                'calls_per_minute': self.calls_per_minute,
+                'calls_per_day': self.calls_per_day,
+                'remaining_minute': int(self._minute.tokens),
+                'remaining_day': int(self._day.tokens),
+            }
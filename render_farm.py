@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Batch dashboard rendering across a process pool
+Renders many get_weather_data() payloads at several panel resolutions; each
+worker keeps its renderers, fonts, glyphs and icons warm between frames
+
+Run: python3 render_farm.py --sample 48 --sizes 800x480,1600x1200 --out renders
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from display_sinks import MemorySink
+from panel_palette import quantize_to_panel
+from config import RENDER_WORKERS, DITHER_MODE
+
+# Renderers of this process by (width, height), kept for the life of a worker
+_renderers = {}
+
+
+def _get_renderer(size):
+    renderer = _renderers.get(size)
+    if renderer is None:
+        from weather_display_pil import WeatherDisplay
+        renderer = _renderers[size] = WeatherDisplay(display=MemorySink(*size))
+    return renderer
+
+
+def _init_worker(quiet):
+    # The renderer logs every icon it loads; only keep that for single runs
+    if quiet:
+        sys.stdout = open(os.devnull, 'w')
+
+
+def _render_job(job):
+    """Render one (payload, size) job in a worker process"""
+    index, payload, size, output_dir, panel_format, compress_level = job
+    start = time.perf_counter()
+    result = {'index': index, 'size': size, 'ok': False, 'png': None, 'path': None}
+    try:
+        renderer = _get_renderer(size)
+        frame = renderer.render_frame(payload)
+        if frame is not None:
+            if panel_format:
+                # What the panel would show, as a small palette PNG
+                frame = quantize_to_panel(frame, renderer.panel, DITHER_MODE, renderer.driver_palette)
+            buffer = io.BytesIO()
+            frame.save(buffer, format='PNG', compress_level=compress_level)
+            if output_dir:
+                path = os.path.join(output_dir, f"dashboard_{index:04d}_{size[0]}x{size[1]}.png")
+                with open(path, 'wb') as f:
+                    f.write(buffer.getvalue())
+                result['path'] = path
+            else:
+                result['png'] = buffer.getvalue()
+            result['ok'] = True
+    except Exception as e:
+        result['error'] = str(e)
+    result['render_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def render_batch(payloads, resolutions, output_dir=None, max_workers=RENDER_WORKERS,
+                 panel_format=False, compress_level=6, quiet=True):
+    """Render every payload at every resolution across a process pool
+
+    Args:
+        payloads: List of get_weather_data() dicts
+        resolutions: List of (width, height) panel sizes
+        output_dir: Write PNGs here and return their paths; None returns the
+            encoded PNG bytes instead
+        max_workers: Worker processes (1 renders in this process)
+        panel_format: Quantize to the panel palette, as the display would get it
+        compress_level: PNG zlib level; lower is faster and larger
+        quiet: Silence the renderer's per-frame logging in the workers
+
+    Returns:
+        dict: {'results': [...], 'frames': int, 'failed': int,
+               'elapsed_seconds': float, 'frames_per_second': float, 'workers': int}
+            Each result has 'index' (into payloads), 'size', 'ok', 'png' or
+            'path', and 'render_ms'; failed renders also have 'error'.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    jobs = [(index, payload, tuple(size), output_dir, panel_format, compress_level)
+            for index, payload in enumerate(payloads) for size in resolutions]
+
+    start = time.monotonic()
+    if max_workers <= 1:
+        with open(os.devnull, 'w') if quiet else contextlib.nullcontext(sys.stdout) as log:
+            with contextlib.redirect_stdout(log):
+                results = [_render_job(job) for job in jobs]
+    else:
+        # Build the icon atlas and load fonts once here, so forked workers
+        # start warm instead of each rebuilding them
+        with open(os.devnull, 'w') if quiet else contextlib.nullcontext(sys.stdout) as log:
+            with contextlib.redirect_stdout(log):
+                for size in resolutions:
+                    _get_renderer(tuple(size))
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(quiet,)) as executor:
+            results = list(executor.map(_render_job, jobs, chunksize=chunksize))
+    elapsed = time.monotonic() - start
+
+    failed = sum(1 for result in results if not result['ok'])
+    return {
+        'results': results,
+        'frames': len(results) - failed,
+        'failed': failed,
+        'elapsed_seconds': elapsed,
+        'frames_per_second': (len(results) - failed) / elapsed if elapsed else 0.0,
+        'workers': max(1, max_workers),
+    }
+
+
+def sample_payload(index):
+    """get_weather_data()-style payload with made-up weather that varies with index"""
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    icons = ['01d', '02d', '03d', '04d', '09d', '10d', '11d', '13d', '50d']
+    temperature = 30 + (index * 7) % 60
+    current = {
+        'city': f"Sample {index}", 'country': 'US',
+        'temperature': temperature, 'feels_like': temperature - 3,
+        'temp_min': temperature - 5, 'temp_max': temperature + 4,
+        'description': 'Partly Cloudy', 'icon': icons[index % len(icons)],
+        'humidity': 40 + index % 50, 'wind_speed': 2.5 + index % 20, 'wind_direction': 180,
+        'pressure': 1016, 'sunrise': now.replace(hour=7, minute=20), 'sunset': now.replace(hour=18, minute=10),
+        'visibility': 10.0, 'uv_index': 2.9, 'air_quality': {'index': 1 + index % 5, 'description': 'Fair'},
+        'timestamp': now,
+    }
+    hourly = [{'time': now + timedelta(hours=3 * i), 'temp': temperature + (i * 5 + index) % 9 - 4,
+               'icon': icons[(index + i) % len(icons)], 'rain_chance': (index * 13 + i * 17) % 101}
+              for i in range(8)]
+    daily = [{'date': (now + timedelta(days=i)).date(), 'day_name': (now + timedelta(days=i)).strftime('%a'),
+              'min_temp': temperature - 8 + i, 'max_temp': temperature + i, 'description': 'Partly Cloudy',
+              'icon': icons[(index + i) % len(icons)], 'humidity': 60, 'wind_speed': 5.0}
+             for i in range(6)]
+    return {'current': current, 'forecast': {'hourly': hourly, 'daily': daily}, 'last_updated': now}
+
+
+def main():
+    """Render sample payloads, or live data for CITY,COUNTRY[,UNITS] locations"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render dashboards across a process pool")
+    parser.add_argument('locations', nargs='*', help="CITY,COUNTRY[,UNITS] to fetch and render")
+    parser.add_argument('--sample', type=int, default=0, help="Render this many made-up payloads instead")
+    parser.add_argument('--sizes', default='800x480', help="Comma-separated WIDTHxHEIGHT list")
+    parser.add_argument('--out', help="Output directory (default: keep PNGs in memory)")
+    parser.add_argument('--workers', type=int, default=RENDER_WORKERS, help="Worker processes")
+    parser.add_argument('--panel', action='store_true', help="Write panel-palette images")
+    parser.add_argument('--compress-level', type=int, default=6, help="PNG compression level 0-9")
+    args = parser.parse_args()
+
+    resolutions = [tuple(int(v) for v in size.split('x')) for size in args.sizes.split(',')]
+    if args.sample:
+        payloads = [sample_payload(i) for i in range(args.sample)]
+    elif args.locations:
+        from batch_fetch import fetch_batch
+        from config import UNITS
+        locations = []
+        for arg in args.locations:
+            parts = arg.split(',')
+            locations.append((parts[0], parts[1] if len(parts) > 1 else '', parts[2] if len(parts) > 2 else UNITS))
+        payloads = [result['data'] for result in fetch_batch(locations)['results'] if result['ok']]
+    else:
+        parser.error("give locations or --sample N")
+
+    batch = render_batch(payloads, resolutions, output_dir=args.out, max_workers=args.workers,
+                         panel_format=args.panel, compress_level=args.compress_level)
+
+    render_times = [result['render_ms'] for result in batch['results'] if result['ok']]
+    print(f"Rendered {batch['frames']} frames ({len(payloads)} payloads x {len(resolutions)} sizes) "
+          f"in {batch['elapsed_seconds']:.2f}s with {batch['workers']} workers")
+    print(f"Throughput: {batch['frames_per_second']:.1f} frames/sec")
+    if render_times:
+        print(f"Per frame: {sum(render_times) / len(render_times):.1f} ms mean, "
+              f"{max(render_times):.1f} ms max (render + encode, per worker)")
+    for result in batch['results']:
+        if not result['ok']:
+            print(f"❌ payload {result['index']} at {result['size'][0]}x{result['size'][1]}: "
+                  f"{result.get('error', 'nothing to render')}")
+    if args.out:
+        print(f"Images written to {args.out}/")
+
+if __name__ == "__main__":
+    main()
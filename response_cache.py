@@ -0,0 +1,114 @@
+"""
+On-disk TTL cache for OpenWeatherMap responses
+Survives restarts so a crashed or restarted service doesn't refetch fresh data
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_response_cache(directory, ttls, max_bytes):
+    """Return the process-wide cache for a directory"""
+    with _shared_lock:
+        cache = _shared_caches.get(directory)
+        if cache is None:
+            cache = _shared_caches[directory] = ResponseCache(directory, ttls, max_bytes)
+        return cache
+
+
+class ResponseCache:
+    def __init__(self, directory, ttls, max_bytes):
+        """
+        Args:
+            directory: Where cached responses are stored, one JSON file each
+            ttls: Seconds each endpoint's responses stay fresh, e.g. {'forecast': 3600}.
+                Endpoints without a TTL are never cached.
+            max_bytes: Total size above which the oldest entries are evicted
+        """
+        self.directory = directory
+        self.ttls = dict(ttls)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _path(self, endpoint, params):
+        # The API key is left out so rotating it doesn't invalidate the cache
+        key_params = sorted((k, str(v)) for k, v in params.items() if k != 'appid')
+        digest = hashlib.sha1(json.dumps([endpoint, key_params]).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{endpoint}-{digest}.json")
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, endpoint, params):
+        """Return the cached response data if it is still fresh, else None"""
+        ttl = self.ttls.get(endpoint)
+        if not ttl:
+            return None
+
+        try:
+            with open(self._path(endpoint, params), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if time.time() - entry['fetched_at'] < ttl:
+                self._count('hits')
+                return entry['data']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        self._count('misses')
+        return None
+
+    def set(self, endpoint, params, data):
+        """Store a response and evict old entries if the cache is over its size limit"""
+        if not self.ttls.get(endpoint):
+            return
+
+        path = self._path(endpoint, params)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': time.time(), 'endpoint': endpoint, 'data': data}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write response cache: {e}")
+            return
+
+        self._count('stores')
+        self._evict()
+
+    def _evict(self):
+        """Delete the least recently written entries until under max_bytes"""
+        with self._lock:
+            try:
+                entries = []
+                for name in os.listdir(self.directory):
+                    if not name.endswith('.json'):
+                        continue
+                    path = os.path.join(self.directory, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                return
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.stats['evictions'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-endpoint circuit breakers in WeatherAPI
+Runs against a fake clock and a fake HTTP session, so it needs no network
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import requests
+import circuit_breaker
+import rate_limiter
+import weather_api
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from rate_limiter import RateLimiter, QuotaExceeded
+from coordinate_cache import CoordinateCache
+from config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+
+
+class FakeClock:
+    """Stands in for the time module; time only passes when sleep() is called"""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@contextmanager
+def fake_clock(*modules):
+    """Run the modules' time.monotonic() and time.sleep() on one FakeClock"""
+    clock = FakeClock()
+    saved = [(module, module.time) for module in modules]
+    for module in modules:
+        module.time = clock
+    try:
+        yield clock
+    finally:
+        for module, original in saved:
+            module.time = original
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Answers each get() with the next queued response, or raises it if it's an exception"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, BaseException):
+            raise reply
+        return reply
+
+    def close(self):
+        pass
+
+
+def make_api(*replies, limiter=None):
+    """WeatherAPI on a FakeSession, with the on-disk response cache off"""
+    if not weather_api.OPENWEATHER_API_KEY:
+        weather_api.OPENWEATHER_API_KEY = 'test-key'
+    api = weather_api.WeatherAPI(session=FakeSession(*replies), rate_limiter=limiter)
+    api.response_cache = None
+    return api
+
+
+def open_circuit(api, endpoint):
+    """Fail the endpoint until its circuit opens"""
+    api.session.replies[:0] = [requests.exceptions.ConnectionError("down")] * CIRCUIT_FAILURE_THRESHOLD
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        try:
+            api._get_json(endpoint, {})
+        except requests.exceptions.ConnectionError:
+            pass
+    assert api.breakers[endpoint].state == CircuitBreaker.OPEN
+
+
+def test_open_circuit_fails_fast():
+    """While open, calls fail without touching the network until the reset timeout"""
+    with fake_clock(circuit_breaker) as clock:
+        api = make_api()
+        open_circuit(api, 'forecast')
+        clock.sleep(CIRCUIT_RESET_SECONDS - 1)
+        try:
+            api._get_json('forecast', {})
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError:
+            pass
+        assert api.session.calls == CIRCUIT_FAILURE_THRESHOLD
+
+
+def test_probe_success_closes_circuit():
+    """A successful half-open probe closes the circuit and clears the failure count"""
+    with fake_clock(circuit_breaker) as clock:
+        api = make_api(FakeResponse({'list': []}))
+        open_circuit(api, 'forecast')
+        clock.sleep(CIRCUIT_RESET_SECONDS)
+
+        assert api._get_json('forecast', {}) == {'list': []}
+        breaker = api.breakers['forecast']
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.failures == 0
+
+
+def test_probe_failure_reopens_circuit():
+    """A failed half-open probe reopens the circuit for another full reset timeout"""
+    with fake_clock(circuit_breaker) as clock:
+        api = make_api(requests.exceptions.Timeout("still down"))
+        open_circuit(api, 'weather')
+        clock.sleep(CIRCUIT_RESET_SECONDS)
+
+        try:
+            api._get_json('weather', {})
+            assert False, "expected Timeout"
+        except requests.exceptions.Timeout:
+            pass
+        breaker = api.breakers['weather']
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.opened_at == clock.now
+
+        # The reset timeout starts over from the failed probe
+        try:
+            api._get_json('weather', {})
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError:
+            pass
+        assert api.session.calls == CIRCUIT_FAILURE_THRESHOLD + 1
+
+
+def test_non_network_error_probe_releases_circuit():
+    """A probe that fails with a non-network error must not hold the circuit half-open"""
+    with fake_clock(circuit_breaker) as clock:
+        api = make_api(ValueError("bad JSON"), FakeResponse({'value': 1.0}))
+        open_circuit(api, 'uvi')
+        clock.sleep(CIRCUIT_RESET_SECONDS)
+
+        try:
+            api._get_json('uvi', {})
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        # Not an endpoint failure, so the circuit stays half-open for the next probe
+        assert api.breakers['uvi'].state == CircuitBreaker.HALF_OPEN
+
+        assert api._get_json('uvi', {}) == {'value': 1.0}
+        assert api.breakers['uvi'].state == CircuitBreaker.CLOSED
+
+
+def test_stale_data_served_while_circuit_open():
+    """get_weather_data_swr() falls back to the last good payload while the API is down"""
+    with fake_clock(circuit_breaker), tempfile.TemporaryDirectory() as workdir:
+        api = make_api()
+        api.provider = 'classic'
+        api.coord_cache = CoordinateCache(os.path.join(workdir, 'coordinates.json'))
+        open_circuit(api, 'weather')
+        open_circuit(api, 'forecast')
+
+        last_updated = datetime.now() - timedelta(minutes=30)
+        api._last_good = {'current': {'temperature': 61}, 'forecast': {'daily': [], 'hourly': []},
+                          'last_updated': last_updated}
+
+        data = api.get_weather_data_swr()
+        api._refresh_thread.join()
+        assert data['stale'] is True
+        assert data['current'] == {'temperature': 61}
+        assert data['age_seconds'] >= 30 * 60
+        # The open circuits answered without any request going out
+        assert api.session.calls == 2 * CIRCUIT_FAILURE_THRESHOLD
+        assert 'stale' not in api._last_good
+
+
+def test_stale_data_served_without_waiting_for_refresh():
+    """A slow refresh doesn't hold up the caller once there is data to fall back to"""
+    api = make_api()
+    fresh = {'current': {'temperature': 64}, 'forecast': {'daily': [], 'hourly': []},
+             'last_updated': datetime.now()}
+    release = threading.Event()
+
+    def slow_refresh():
+        release.wait(10)
+        return fresh
+    api.get_weather_data = slow_refresh
+
+    # Cold start: nothing to fall back to, so the caller waits for the refresh
+    release.set()
+    assert api.get_weather_data_swr() is fresh
+
+    release.clear()
+    refreshed = []
+    data = api.get_weather_data_swr(on_refresh=refreshed.append)
+    assert data['stale'] is True
+    assert data['current'] == {'temperature': 64}
+    assert api._refresh_thread.is_alive()
+
+    release.set()
+    api._refresh_thread.join()
+    assert refreshed == [fresh]
+
+
+def test_quota_exhausted_probe_releases_circuit():
+    """A half-open probe stopped by the quota limiter must not hold the circuit open"""
+    with fake_clock(circuit_breaker, rate_limiter) as clock:
+        api = make_api(FakeResponse({'value': 3.2}))
+        open_circuit(api, 'uvi')
+        clock.sleep(CIRCUIT_RESET_SECONDS)
+
+        # A daily budget of one call, already spent: the next call can't wait it out
+        api.rate_limiter = RateLimiter(calls_per_minute=60, calls_per_day=1)
+        api.rate_limiter.acquire()
+        try:
+            api._get_json('uvi', {})
+            assert False, "expected QuotaExceeded"
+        except QuotaExceeded:
+            pass
+        assert api.breakers['uvi'].state == CircuitBreaker.HALF_OPEN
+
+        # Once quota is back the probe goes out and closes the circuit
+        api.rate_limiter = None
+        assert api._get_json('uvi', {}) == {'value': 3.2}
+        assert api.breakers['uvi'].state == CircuitBreaker.CLOSED
+        assert api.session.calls == CIRCUIT_FAILURE_THRESHOLD + 1
+
+
+def main():
+    """Run every test in this file"""
+    tests = [(name, func) for name, func in globals().items() if name.startswith('test_') and callable(func)]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {e!r}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the e-ink refresh gate
+Renders into a memory sink, so it needs no panel and no network
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from PIL import ImageChops
+import frame_diff
+import weather_display_pil
+from display_sinks import MemorySink
+from frame_diff import RefreshGate
+from panel_palette import DITHER_MODES
+from render_farm import sample_payload
+
+
+@contextmanager
+def counted_quantize():
+    """Count quantize_to_panel() calls made by the renderer and the refresh gate"""
+    original = frame_diff.quantize_to_panel
+    calls = []
+
+    def counting(*args, **kwargs):
+        calls.append(args[2] if len(args) > 2 else kwargs.get('dither'))
+        return original(*args, **kwargs)
+
+    weather_display_pil.quantize_to_panel = frame_diff.quantize_to_panel = counting
+    try:
+        yield calls
+    finally:
+        weather_display_pil.quantize_to_panel = frame_diff.quantize_to_panel = original
+
+
+@contextmanager
+def work_dir():
+    """Run in a temporary directory so debug output and caches stay out of the repo"""
+    icons = os.path.abspath('icons')
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.symlink(icons, os.path.join(directory, 'icons'))
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+def make_display(dither, policy='ignore_timestamp'):
+    """WeatherDisplay on a MemorySink, quantizing with the given dither mode"""
+    display = weather_display_pil.WeatherDisplay(MemorySink(800, 480))
+    display.refresh_gate = RefreshGate(display.panel, policy, 0, dither, display.driver_palette)
+    return display
+
+
+def test_one_quantization_per_update():
+    """Each update_display() quantizes the frame once, shown or skipped"""
+    original_mode = weather_display_pil.DITHER_MODE
+    try:
+        with work_dir():
+            for dither in DITHER_MODES:
+                weather_display_pil.DITHER_MODE = dither
+                display = make_display(dither)
+                payload = sample_payload(1)
+                with counted_quantize() as calls:
+                    display.update_display(payload)
+                    display.update_display(payload)
+                assert calls == [dither, dither], f"{dither}: quantized {len(calls)} times in 2 updates"
+                # The second, identical frame was skipped
+                assert display.display.frames_shown == 1, dither
+    finally:
+        weather_display_pil.DITHER_MODE = original_mode
+
+def test_clock_stays_inside_ignore_box():
+    """Every time the clock can show is drawn inside the box the gate ignores"""
+    with work_dir():
+        display = make_display('floyd')
+        payload = sample_payload(1)
+        times = [datetime(2024, 1, 1, hour, minute) for hour in range(24) for minute in (0, 8, 11, 48, 59)]
+
+        base = display.render_frame({**payload, 'last_updated': times[0]})
+        boxes = [display.timestamp_box]
+        for moment in times[1:]:
+            frame = display.render_frame({**payload, 'last_updated': moment})
+            boxes.append(display.timestamp_box)
+            changed = ImageChops.difference(base, frame).getbbox()
+            if changed is None:
+                continue
+            left, top, right, bottom = display.timestamp_box
+            assert left <= changed[0] and top <= changed[1] and changed[2] <= right and changed[3] <= bottom, \
+                f"{moment:%I:%M%p} drew {changed} outside {display.timestamp_box}"
+        # The box doesn't move with the time, so frames stay comparable
+        assert len(set(boxes)) == 1, set(boxes)
+
+
+def main():
+    """Run every test in this file"""
+    tests = [(name, func) for name, func in globals().items() if name.startswith('test_') and callable(func)]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {e!r}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
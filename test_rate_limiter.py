@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the OpenWeatherMap quota limiter
+Runs against a fake clock and a fake HTTP session, so it needs no network
+"""
+
+import sys
+import rate_limiter
+from rate_limiter import RateLimiter, QuotaExceeded
+from test_circuit_breaker import fake_clock, make_api, FakeResponse
+
+
+def test_minute_budget_waits_for_refill():
+    """Past the per-minute budget, acquire() sleeps until a call refills"""
+    with fake_clock(rate_limiter) as clock:
+        limiter = RateLimiter(calls_per_minute=2, calls_per_day=100)
+        start = clock.now
+        limiter.acquire()
+        limiter.acquire()
+        assert clock.now == start
+
+        limiter.acquire()
+        # One call refills every 30 seconds at 2 per minute
+        assert abs(clock.now - start - 30) < 1e-6
+        assert limiter.stats['calls'] == 3
+        assert limiter.stats['waits'] == 1
+
+
+def test_daily_quota_exhausted():
+    """Once the daily budget is spent, a bounded acquire() gives up instead of sleeping for hours"""
+    with fake_clock(rate_limiter) as clock:
+        limiter = RateLimiter(calls_per_minute=60, calls_per_day=2)
+        limiter.acquire()
+        limiter.acquire()
+        start = clock.now
+        try:
+            limiter.acquire(max_wait=60)
+            assert False, "expected QuotaExceeded"
+        except QuotaExceeded:
+            pass
+        assert clock.now == start
+        assert limiter.stats['rejected'] == 1
+        assert limiter.stats['calls'] == 2
+
+
+def test_daily_quota_holds_over_any_24_hours():
+    """No 24-hour window ever sees more than calls_per_day calls, even from a fresh limiter"""
+    with fake_clock(rate_limiter) as clock:
+        limiter = RateLimiter(calls_per_minute=60, calls_per_day=10)
+        start = clock.now
+        calls = []
+        while clock.now < start + 3 * 86400:
+            limiter.acquire()
+            calls.append(clock.now)
+            clock.sleep(600)
+
+        for i, call in enumerate(calls):
+            in_window = sum(1 for other in calls[:i + 1] if call - other < 86400)
+            assert in_window <= 10, f"{in_window} calls in the 24h before {call - start:.0f}s"
+        # The budget is still fully usable once a day
+        assert len(calls) >= 3 * 10
+
+
+def test_try_acquire_never_sleeps():
+    """try_acquire() returns the wait instead of sleeping, for callers on an event loop"""
+    with fake_clock(rate_limiter) as clock:
+        limiter = RateLimiter(calls_per_minute=1, calls_per_day=100)
+        assert limiter.try_acquire() == 0
+        wait = limiter.try_acquire()
+        assert abs(wait - 60) < 1e-6
+
+        clock.sleep(wait)
+        assert limiter.try_acquire(max_wait=60, waited=wait) == 0
+        assert limiter.stats['waits'] == 1
+
+
+def test_quota_exhausted_skips_request():
+    """WeatherAPI raises QuotaExceeded without sending the request or counting an endpoint failure"""
+    with fake_clock(rate_limiter):
+        limiter = RateLimiter(calls_per_minute=60, calls_per_day=1)
+        api = make_api(FakeResponse({'value': 2.0}), limiter=limiter)
+        assert api._get_json('uvi', {}) == {'value': 2.0}
+
+        try:
+            api._get_json('uvi', {})
+            assert False, "expected QuotaExceeded"
+        except QuotaExceeded:
+            pass
+        assert api.session.calls == 1
+        assert api.breakers['uvi'].failures == 0
+
+
+def main():
+    """Run every test in this file"""
+    tests = [(name, func) for name, func in globals().items() if name.startswith('test_') and callable(func)]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {e!r}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk OpenWeatherMap response cache
+Runs in a temporary directory against a fake clock, so it needs no network
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+import response_cache
+from response_cache import ResponseCache
+
+TTLS = {'weather': 600, 'forecast': 3600}
+
+
+class FakeClock:
+    """Stands in for the time module; time only passes when advance() is called"""
+
+    def __init__(self, start=1_700_000_000.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@contextmanager
+def cache_dir():
+    """A temporary cache directory and a fake clock for response_cache"""
+    clock = FakeClock()
+    original = response_cache.time
+    response_cache.time = clock
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            yield directory, clock
+    finally:
+        response_cache.time = original
+
+
+def test_ttl_expiry_per_endpoint():
+    """Each endpoint's responses go stale after its own TTL"""
+    with cache_dir() as (directory, clock):
+        cache = ResponseCache(directory, TTLS, max_bytes=1_000_000)
+        cache.set('weather', {'q': 'Paris'}, {'temp': 12})
+        cache.set('forecast', {'q': 'Paris'}, {'list': []})
+
+        clock.advance(599)
+        assert cache.get('weather', {'q': 'Paris'}) == {'temp': 12}
+        clock.advance(1)
+        assert cache.get('weather', {'q': 'Paris'}) is None
+        assert cache.get('forecast', {'q': 'Paris'}) == {'list': []}
+
+        clock.advance(3000)
+        assert cache.get('forecast', {'q': 'Paris'}) is None
+
+
+def test_endpoint_without_ttl_is_not_cached():
+    """Endpoints missing from the TTL table are never stored"""
+    with cache_dir() as (directory, _):
+        cache = ResponseCache(directory, TTLS, max_bytes=1_000_000)
+        cache.set('uvi', {'lat': 1, 'lon': 2}, {'value': 3})
+        assert cache.get('uvi', {'lat': 1, 'lon': 2}) is None
+        assert cache.get_stats()['stores'] == 0
+
+
+def test_counters():
+    """Hits, misses and stores are counted"""
+    with cache_dir() as (directory, _):
+        cache = ResponseCache(directory, TTLS, max_bytes=1_000_000)
+        assert cache.get('weather', {'q': 'Oslo'}) is None
+        cache.set('weather', {'q': 'Oslo'}, {'temp': 3})
+        cache.get('weather', {'q': 'Oslo'})
+        cache.get('weather', {'q': 'Oslo'})
+        assert cache.get_stats() == {'hits': 2, 'misses': 1, 'stores': 1, 'evictions': 0}
+
+
+def test_max_bytes_evicts_oldest():
+    """Over max_bytes, the least recently written entries are deleted first"""
+    with cache_dir() as (directory, _):
+        cache = ResponseCache(directory, TTLS, max_bytes=1_000_000)
+        payload = {'text': 'x' * 400}
+        for i, city in enumerate(('A', 'B', 'C')):
+            cache.set('weather', {'q': city}, payload)
+            # Give every entry a distinct write time, oldest first
+            os.utime(cache._path('weather', {'q': city}), (1000 + i, 1000 + i))
+
+        entry_size = os.path.getsize(cache._path('weather', {'q': 'A'}))
+        cache.max_bytes = 3 * entry_size
+        cache.set('weather', {'q': 'D'}, payload)
+
+        assert cache.get('weather', {'q': 'A'}) is None
+        for city in ('B', 'C', 'D'):
+            assert cache.get('weather', {'q': city}) == payload
+        assert cache.get_stats()['evictions'] == 1
+
+
+def test_entries_survive_new_instance():
+    """A new cache on the same directory, e.g. after a restart, serves earlier responses"""
+    with cache_dir() as (directory, clock):
+        ResponseCache(directory, TTLS, max_bytes=1_000_000).set('forecast', {'q': 'Rome'}, {'list': [1]})
+        clock.advance(60)
+        restarted = ResponseCache(directory, TTLS, max_bytes=1_000_000)
+        assert restarted.get('forecast', {'q': 'Rome'}) == {'list': [1]}
+        assert restarted.get_stats()['hits'] == 1
+
+
+def test_key_ignores_appid():
+    """Rotating the API key doesn't invalidate cached responses"""
+    with cache_dir() as (directory, _):
+        cache = ResponseCache(directory, TTLS, max_bytes=1_000_000)
+        cache.set('weather', {'q': 'Lima', 'units': 'metric', 'appid': 'old-key'}, {'temp': 20})
+        assert cache.get('weather', {'units': 'metric', 'q': 'Lima', 'appid': 'new-key'}) == {'temp': 20}
+        # Other parameters still tell requests apart
+        assert cache.get('weather', {'q': 'Lima', 'units': 'imperial', 'appid': 'old-key'}) is None
+
+
+def main():
+    """Run every test in this file"""
+    tests = [(name, func) for name, func in globals().items() if name.startswith('test_') and callable(func)]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {e!r}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
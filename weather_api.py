@@ -1,82 +1,232 @@
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from config import OPENWEATHER_API_KEY, CITY_NAME, COUNTRY_CODE, UNITS
+from requests.adapters import HTTPAdapter
+from coordinate_cache import get_coordinate_cache
+from response_cache import get_response_cache
+from circuit_breaker import CircuitBreaker
+from forecast_aggregation import aggregate_daily
+from config import (OPENWEATHER_API_KEY, CITY_NAME, COUNTRY_CODE, UNITS,
+                    WEATHER_PROVIDER, OWM_BASE_URL, OWM_ONECALL_URL,
+                    HTTP_POOL_SIZE, HTTP_KEEP_ALIVE, API_TIMEOUTS, FETCH_CONCURRENTLY,
+                    COORD_CACHE_FILE, QUOTA_MAX_WAIT_SECONDS, RESPONSE_CACHE_ENABLED,
+                    RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTLS, RESPONSE_CACHE_MAX_BYTES,
+                    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
 
 class WeatherAPI:
-    def __init__(self):
+    def __init__(self, city=None, country=None, units=None, rate_limiter=None, session=None,
+                 provider=None):
         self.api_key = OPENWEATHER_API_KEY
-        self.city = CITY_NAME
-        self.country = COUNTRY_CODE
-        self.units = UNITS
-        self.base_url = "http://api.openweathermap.org/data/2.5"
-        
+        self.city = city or CITY_NAME
+        self.country = country or COUNTRY_CODE
+        self.units = units or UNITS
+        self.provider = provider or WEATHER_PROVIDER
+        self.base_url = OWM_BASE_URL
+        self.onecall_url = OWM_ONECALL_URL
+        self.timeouts = dict(API_TIMEOUTS)
+
         if not self.api_key:
             raise ValueError("OpenWeatherMap API key not found. Please set OPENWEATHER_API_KEY in your .env file")
-    
+
+        # One long-lived session so every update cycle reuses pooled
+        # keep-alive connections instead of paying a new TCP handshake per call
+        self.session = session or self._create_session()
+
+        # Optional quota limiter shared between instances (see batch_fetch.py)
+        self.rate_limiter = rate_limiter
+
+        # Responses still within their endpoint's TTL are served from disk,
+        # skipping the network and the quota entirely
+        self.response_cache = None
+        if RESPONSE_CACHE_ENABLED:
+            self.response_cache = get_response_cache(RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTLS,
+                                                     RESPONSE_CACHE_MAX_BYTES)
+
+        # Coordinates never change for a configured city, so remember them
+        # and let every endpoint go out by lat/lon after the first lookup
+        self.coord_cache = get_coordinate_cache(COORD_CACHE_FILE)
+
+        # One circuit breaker per endpoint so an outage fails fast instead
+        # of waiting through every timeout on each cycle
+        self.breakers = {}
+
+        # Last good payload and the in-flight background refresh for
+        # get_weather_data_swr()
+        self._last_good = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+        self._refresh_done = None
+        self._refresh_result = None
+        self._stale_served = False
+
+    def _create_session(self):
+        """Create the pooled HTTP session shared by all endpoint calls"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not HTTP_KEEP_ALIVE:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def _get_json(self, endpoint, params, base_url=None):
+        """GET an API endpoint through the pooled session and return the decoded JSON
+
+        Raises requests.exceptions.RequestException on network or HTTP errors.
+        """
+        if self.response_cache:
+            cached = self.response_cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+
+        breaker = self._get_breaker(endpoint)
+        probe = breaker.before_call()
+
+        url = f"{base_url or self.base_url}/{endpoint}"
+        try:
+            # Running out of quota says nothing about the endpoint, so it
+            # isn't recorded as a failure
+            if self.rate_limiter:
+                self.rate_limiter.acquire(max_wait=QUOTA_MAX_WAIT_SECONDS)
+
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeouts.get(endpoint, 10))
+                if response.status_code == 429 and self.rate_limiter:
+                    self.rate_limiter.record_throttled()
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException:
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+        finally:
+            if probe:
+                breaker.release()
+
+        if self.response_cache:
+            self.response_cache.set(endpoint, params, data)
+        return data
+
+    def _get_breaker(self, endpoint):
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers.setdefault(
+                endpoint, CircuitBreaker(endpoint, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS))
+        return breaker
+
+    def get_connection_stats(self):
+        """Return request counts split into new vs. reused pooled connections"""
+        stats = {'requests': 0, 'new_connections': 0, 'reused_connections': 0}
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['requests'] += pool.num_requests
+                stats['new_connections'] += pool.num_connections
+        stats['reused_connections'] = max(0, stats['requests'] - stats['new_connections'])
+        return stats
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+    @property
+    def location_query(self):
+        """City query string used for name-based lookups"""
+        return f"{self.city},{self.country}"
+
+    def _location_params(self, location=None):
+        """Query parameters for the configured city, by coordinates when known"""
+        if location is None:
+            location = self.coord_cache.get(self.location_query)
+        if location:
+            return {'lat': location['lat'], 'lon': location['lon']}
+        return {'q': self.location_query}
+
+    def _remember_location(self, data):
+        """Cache the coordinates from a /weather response and return them"""
+        location = self.coord_cache.get(self.location_query)
+        if location is None:
+            location = self.coord_cache.set(self.location_query,
+                                            data['coord']['lat'], data['coord']['lon'],
+                                            data['name'], data['sys']['country'])
+            print(f"Cached coordinates for {self.location_query}: {location['lat']}, {location['lon']}")
+        return location
+
     def get_current_weather(self):
         """Fetch current weather data"""
-        url = f"{self.base_url}/weather"
         params = {
-            'q': f"{self.city},{self.country}",
+            **self._location_params(),
             'appid': self.api_key,
             'units': self.units
         }
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('weather', params)
 
             # Get coordinates for additional API calls
-            lat = data['coord']['lat']
-            lon = data['coord']['lon']
+            location = self._remember_location(data)
+            lat = location['lat']
+            lon = location['lon']
 
             # Fetch UV index and air quality
             uv_index = self.get_uv_index(lat, lon)
             air_quality = self.get_air_quality(lat, lon)
 
-            return {
-                'temperature': round(data['main']['temp']),
-                'feels_like': round(data['main']['feels_like']),
-                'temp_min': round(data['main']['temp_min']),
-                'temp_max': round(data['main']['temp_max']),
-                'humidity': data['main']['humidity'],
-                'pressure': data['main']['pressure'],
-                'wind_speed': data['wind']['speed'],
-                'wind_direction': data['wind'].get('deg', 0),
-                'description': data['weather'][0]['description'].title(),
-                'icon': data['weather'][0]['icon'],
-                'city': data['name'],
-                'country': data['sys']['country'],
-                'sunrise': datetime.fromtimestamp(data['sys']['sunrise']),
-                'sunset': datetime.fromtimestamp(data['sys']['sunset']),
-                'visibility': data.get('visibility', 10000) / 1000,  # Convert to km
-                'uv_index': uv_index,
-                'air_quality': air_quality,
-                'timestamp': datetime.now(),
-                'lat': lat,
-                'lon': lon
-            }
+            return self._parse_current_weather(data, uv_index, air_quality, location)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching current weather: {e}")
             return None
 
+    def _parse_current_weather(self, data, uv_index, air_quality, location=None):
+        """Convert a /weather response into the current weather dict
+
+        A cached location overrides the station name OpenWeatherMap reports
+        for coordinate queries, so the header keeps showing the configured city.
+        """
+        if location is None:
+            location = {'name': data['name'], 'country': data['sys']['country']}
+
+        return {
+            'temperature': round(data['main']['temp']),
+            'feels_like': round(data['main']['feels_like']),
+            'temp_min': round(data['main']['temp_min']),
+            'temp_max': round(data['main']['temp_max']),
+            'humidity': data['main']['humidity'],
+            'pressure': data['main']['pressure'],
+            'wind_speed': data['wind']['speed'],
+            'wind_direction': data['wind'].get('deg', 0),
+            'description': data['weather'][0]['description'].title(),
+            'icon': data['weather'][0]['icon'],
+            'city': location['name'],
+            'country': location['country'],
+            'sunrise': datetime.fromtimestamp(data['sys']['sunrise']),
+            'sunset': datetime.fromtimestamp(data['sys']['sunset']),
+            'visibility': data.get('visibility', 10000) / 1000,  # Convert to km
+            'uv_index': uv_index,
+            'air_quality': air_quality,
+            'timestamp': datetime.now(),
+            'lat': data['coord']['lat'],
+            'lon': data['coord']['lon']
+        }
+
     def get_uv_index(self, lat, lon):
         """Fetch UV index data"""
         try:
             # Note: OpenWeatherMap free tier may not support UV index
             # This is a placeholder - you may need One Call API
-            url = f"http://api.openweathermap.org/data/2.5/uvi"
             params = {
                 'lat': lat,
                 'lon': lon,
                 'appid': self.api_key
             }
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                return round(data.get('value', 0), 1)
+            data = self._get_json('uvi', params)
+            return round(data.get('value', 0), 1)
         except:
             pass
         return 0
@@ -84,94 +234,276 @@ class WeatherAPI:
     def get_air_quality(self, lat, lon):
         """Fetch air quality data"""
         try:
-            url = f"{self.base_url}/air_pollution"
             params = {
                 'lat': lat,
                 'lon': lon,
                 'appid': self.api_key
             }
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                aqi = data['list'][0]['main']['aqi']
-                # Convert to descriptive text
-                aqi_text = ['Good', 'Fair', 'Moderate', 'Poor', 'Very Poor']
-                return {'index': aqi, 'description': aqi_text[min(aqi-1, 4)]}
+            data = self._get_json('air_pollution', params)
+            aqi = data['list'][0]['main']['aqi']
+            # Convert to descriptive text
+            aqi_text = ['Good', 'Fair', 'Moderate', 'Poor', 'Very Poor']
+            return {'index': aqi, 'description': aqi_text[min(aqi-1, 4)]}
         except:
             pass
         return {'index': 0, 'description': 'N/A'}
     
     def get_forecast(self, days=10):
         """Fetch weather forecast for specified number of days"""
-        url = f"{self.base_url}/forecast"
         params = {
-            'q': f"{self.city},{self.country}",
+            **self._location_params(),
             'appid': self.api_key,
             'units': self.units
         }
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            # Group forecasts by day
-            daily_forecasts = {}
-            hourly_data = []
-
-            for item in data['list']:
-                date = datetime.fromtimestamp(item['dt']).date()
-                if date not in daily_forecasts:
-                    daily_forecasts[date] = []
-                daily_forecasts[date].append(item)
-
-                    # Store hourly data for timeline (next 24 hours)
-                # Only take 7 forecast points to leave room for "Now" point
-                if len(hourly_data) < 7:
-                    hourly_data.append({
-                        'time': datetime.fromtimestamp(item['dt']),
-                        'temp': round(item['main']['temp']),
-                        'icon': item['weather'][0]['icon'],
-                        'rain_chance': round(item.get('pop', 0) * 100)  # Probability of precipitation as percentage
-                    })
-
-            # Get daily summaries
-            forecast_days = []
-            print(f"Total forecast days available: {len(daily_forecasts)}")
-            for i, (date, day_forecasts) in enumerate(list(daily_forecasts.items())[:days+1]):
-                print(f"Processing day {i}: {date} ({date.strftime('%a')})")
-                # Get min/max temps and most common weather
-                temps = [f['main']['temp'] for f in day_forecasts]
-                weather_conditions = [f['weather'][0]['description'] for f in day_forecasts]
-
-                # Find most common weather condition
-                most_common_weather = max(set(weather_conditions), key=weather_conditions.count)
-
-                # Always use short day name (Mon, Tue, Wed, etc.)
-                day_name = date.strftime('%a')
-
-                forecast_days.append({
-                    'date': date,
-                    'day_name': day_name,
-                    'min_temp': round(min(temps)),
-                    'max_temp': round(max(temps)),
-                    'description': most_common_weather.title(),
-                    'icon': day_forecasts[0]['weather'][0]['icon'],
-                    'humidity': round(sum(f['main']['humidity'] for f in day_forecasts) / len(day_forecasts)),
-                    'wind_speed': round(sum(f['wind']['speed'] for f in day_forecasts) / len(day_forecasts), 1)
-                })
-
-            return {'daily': forecast_days, 'hourly': hourly_data}
+            data = self._get_json('forecast', params)
+            return self._parse_forecast(data, days)
 
         except requests.exceptions.RequestException as e:
             print(f"Error fetching forecast: {e}")
             return {'daily': [], 'hourly': []}
-    
-    def get_weather_data(self):
-        """Get both current weather and forecast data"""
-        current = self.get_current_weather()
-        forecast = self.get_forecast()
 
+    def _parse_forecast(self, data, days=10):
+        """Group a /forecast response into daily summaries and hourly points"""
+        # Store hourly data for timeline (next 24 hours)
+        # Only take 7 forecast points to leave room for "Now" point
+        hourly_data = []
+        for item in data['list'][:7]:
+            hourly_data.append({
+                'time': datetime.fromtimestamp(item['dt']),
+                'temp': round(item['main']['temp']),
+                'icon': item['weather'][0]['icon'],
+                'rain_chance': round(item.get('pop', 0) * 100)  # Probability of precipitation as percentage
+            })
+
+        # Get daily summaries
+        all_days = aggregate_daily(data['list'])
+        forecast_days = all_days[:days+1]
+        print(f"Total forecast days available: {len(all_days)}")
+        for i, day in enumerate(forecast_days):
+            print(f"Processing day {i}: {day['date']} ({day['day_name']})")
+
+        return {'daily': forecast_days, 'hourly': hourly_data}
+
+    def _fetch_concurrently(self):
+        """Fetch current weather and forecast with overlapping requests
+
+        With cached coordinates all four endpoints go out at once. On the
+        first run the forecast overlaps the current weather call, and UV and
+        air quality follow in parallel once the coordinates are known.
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            forecast_future = executor.submit(self.get_forecast)
+
+            location = self.coord_cache.get(self.location_query)
+            if location:
+                uv_future = executor.submit(self.get_uv_index, location['lat'], location['lon'])
+                air_future = executor.submit(self.get_air_quality, location['lat'], location['lon'])
+
+            params = {
+                **self._location_params(location),
+                'appid': self.api_key,
+                'units': self.units
+            }
+
+            current = None
+            try:
+                data = self._get_json('weather', params)
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching current weather: {e}")
+            else:
+                if location is None:
+                    location = self._remember_location(data)
+                    uv_future = executor.submit(self.get_uv_index, location['lat'], location['lon'])
+                    air_future = executor.submit(self.get_air_quality, location['lat'], location['lon'])
+                current = self._parse_current_weather(data, uv_future.result(), air_future.result(), location)
+
+            forecast = forecast_future.result()
+
+        return current, forecast
+
+    def get_weather_data(self, concurrent=None):
+        """Get both current weather and forecast data
+
+        Args:
+            concurrent: Overlap the endpoint calls instead of running them in
+                series. Defaults to FETCH_CONCURRENTLY from config.
+        """
+        if self.provider == 'onecall':
+            return self.get_onecall_weather_data()
+
+        if concurrent is None:
+            concurrent = FETCH_CONCURRENTLY
+
+        if concurrent:
+            current, forecast = self._fetch_concurrently()
+        else:
+            current = self.get_current_weather()
+            forecast = self.get_forecast()
+
+        return self._merge_weather_data(current, forecast)
+
+    def get_onecall_weather_data(self):
+        """Get current weather and forecast from a single One Call request
+
+        Air quality is not part of One Call and is fetched alongside it; its
+        longer cache TTL means it usually comes from the response cache.
+        """
+        location = self.coord_cache.get(self.location_query)
+        if location is None:
+            # One Call only takes coordinates; look them up by name once
+            params = {'q': self.location_query, 'appid': self.api_key, 'units': self.units}
+            try:
+                location = self._remember_location(self._get_json('weather', params))
+            except requests.exceptions.RequestException as e:
+                print(f"Error looking up coordinates: {e}")
+                return self._merge_weather_data(None, {'daily': [], 'hourly': []})
+
+        params = {
+            'lat': location['lat'],
+            'lon': location['lon'],
+            'exclude': 'minutely,alerts',
+            'appid': self.api_key,
+            'units': self.units
+        }
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            air_future = executor.submit(self.get_air_quality, location['lat'], location['lon'])
+            try:
+                data = self._get_json('onecall', params, base_url=self.onecall_url)
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching One Call weather: {e}")
+                data = None
+            air_quality = air_future.result()
+
+        if data is None:
+            return self._merge_weather_data(None, {'daily': [], 'hourly': []})
+
+        current = self._parse_onecall_current(data, air_quality, location)
+        forecast = self._parse_onecall_forecast(data)
+        return self._merge_weather_data(current, forecast)
+
+    def _parse_onecall_current(self, data, air_quality, location):
+        """Convert a One Call response into the current weather dict"""
+        current = data['current']
+        # One Call has no min/max for "now", so use today's daily range
+        today = data['daily'][0]['temp'] if data.get('daily') else {'min': current['temp'], 'max': current['temp']}
+
+        return {
+            'temperature': round(current['temp']),
+            'feels_like': round(current['feels_like']),
+            'temp_min': round(today['min']),
+            'temp_max': round(today['max']),
+            'humidity': current['humidity'],
+            'pressure': current['pressure'],
+            'wind_speed': current['wind_speed'],
+            'wind_direction': current.get('wind_deg', 0),
+            'description': current['weather'][0]['description'].title(),
+            'icon': current['weather'][0]['icon'],
+            'city': location['name'],
+            'country': location['country'],
+            'sunrise': datetime.fromtimestamp(current['sunrise']),
+            'sunset': datetime.fromtimestamp(current['sunset']),
+            'visibility': current.get('visibility', 10000) / 1000,  # Convert to km
+            'uv_index': round(current.get('uvi', 0), 1),
+            'air_quality': air_quality,
+            'timestamp': datetime.now(),
+            'lat': data['lat'],
+            'lon': data['lon']
+        }
+
+    def _parse_onecall_forecast(self, data, days=10):
+        """Convert One Call hourly/daily arrays into the forecast dict"""
+        # Sample the hourly data every 3 hours to match the classic forecast,
+        # keeping 7 points to leave room for the "Now" point
+        hourly_data = []
+        for item in data.get('hourly', [])[3::3][:7]:
+            hourly_data.append({
+                'time': datetime.fromtimestamp(item['dt']),
+                'temp': round(item['temp']),
+                'icon': item['weather'][0]['icon'],
+                'rain_chance': round(item.get('pop', 0) * 100)  # Probability of precipitation as percentage
+            })
+
+        forecast_days = []
+        for item in data.get('daily', [])[:days+1]:
+            date = datetime.fromtimestamp(item['dt']).date()
+            forecast_days.append({
+                'date': date,
+                'day_name': date.strftime('%a'),
+                'min_temp': round(item['temp']['min']),
+                'max_temp': round(item['temp']['max']),
+                'description': item['weather'][0]['description'].title(),
+                'icon': item['weather'][0]['icon'],
+                'humidity': item['humidity'],
+                'wind_speed': round(item['wind_speed'], 1)
+            })
+
+        return {'daily': forecast_days, 'hourly': hourly_data}
+
+    def get_weather_data_swr(self, on_refresh=None):
+        """Get weather data, serving the last good payload while refreshing
+
+        A refresh always starts (or joins one already running). If there is
+        a last good payload it comes back at once, marked with 'stale': True
+        and its 'age_seconds', and the refresh carries on in the background.
+        Only a cold start, with nothing to fall back to, waits for the refresh.
+
+        Args:
+            on_refresh: Called with the fresh payload if the background
+                refresh succeeds after stale data was returned
+        """
+        with self._refresh_lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_done = threading.Event()
+                self._refresh_result = None
+                self._stale_served = False
+                self._refresh_thread = threading.Thread(
+                    target=self._background_refresh, args=(self._refresh_done, on_refresh), daemon=True)
+                self._refresh_thread.start()
+            done = self._refresh_done
+
+            if self._last_good is not None:
+                self._stale_served = True
+                stale = dict(self._last_good)
+            else:
+                stale = None
+
+        if stale is None:
+            # Nothing to fall back to yet, so wait for the refresh however long it takes
+            done.wait()
+            with self._refresh_lock:
+                return self._refresh_result
+
+        stale['stale'] = True
+        stale['age_seconds'] = (datetime.now() - stale['last_updated']).total_seconds()
+        print(f"Serving last good weather data ({stale['age_seconds']:.0f}s old) while refreshing")
+        return stale
+
+    def _background_refresh(self, done, on_refresh):
+        try:
+            data = self.get_weather_data()
+        except Exception as e:
+            print(f"Error refreshing weather data: {e}")
+            data = None
+
+        with self._refresh_lock:
+            if self._is_good(data):
+                self._last_good = data
+            self._refresh_result = data
+            deliver = self._stale_served and self._is_good(data)
+            done.set()
+
+        if deliver and on_refresh:
+            on_refresh(data)
+
+    @staticmethod
+    def _is_good(data):
+        return bool(data and data.get('current'))
+
+    def _merge_weather_data(self, current, forecast):
+        """Combine current weather and forecast into the structure the displays consume"""
         # Merge current weather into today's forecast for accurate today's data
         if current and forecast and forecast.get('daily') and len(forecast['daily']) > 0:
             today = datetime.now().date()
@@ -7,6 +7,7 @@ Updates every 30 minutes with current weather and forecast data
 import schedule
 import time
 import logging
+import threading
 from datetime import datetime
 from weather_api import WeatherAPI
 from weather_display_pil import WeatherDisplay
@@ -28,6 +29,8 @@ class WeatherDashboard:
         self.display = WeatherDisplay()
         self.last_update = None
         self.update_count = 0
+        # Background refreshes can finish while a scheduled update is drawing
+        self.display_lock = threading.Lock()
         
         logging.info("Weather Dashboard initialized")
         logging.info(f"Update interval: {UPDATE_INTERVAL_MINUTES} minutes")
@@ -37,31 +40,60 @@ class WeatherDashboard:
         try:
             logging.info("Starting weather update...")
             
-            # Fetch weather data
-            weather_data = self.weather_api.get_weather_data()
+            # Show the last good data at once while the refresh runs in the
+            # background; on_background_refresh redraws when it succeeds
+            weather_data = self.weather_api.get_weather_data_swr(on_refresh=self.on_background_refresh)
             
             if weather_data and weather_data.get('current'):
+                if weather_data.get('stale'):
+                    logging.info(f"Showing last good weather data ({weather_data['age_seconds'] / 60:.0f} minutes old) while refreshing")
+
                 # Update display
-                self.display.update_display(weather_data)
+                with self.display_lock:
+                    self.display.update_display(weather_data)
                 
                 self.last_update = datetime.now()
                 self.update_count += 1
                 
                 logging.info(f"Weather update successful (update #{self.update_count})")
                 logging.info(f"Current temperature: {weather_data['current']['temperature']}°")
-                
+
+                stats = self.weather_api.get_connection_stats()
+                logging.info(f"HTTP connections: {stats['reused_connections']} reused, "
+                             f"{stats['new_connections']} new over {stats['requests']} requests")
+                if self.weather_api.response_cache:
+                    cache_stats = self.weather_api.response_cache.get_stats()
+                    logging.info(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+                icon_stats = self.display.icon_cache.get_stats()
+                logging.info(f"Icon cache: {icon_stats['hits']} hits, {icon_stats['misses']} misses")
+                refresh_stats = self.display.refresh_gate.get_stats()
+                logging.info(f"Display refreshes: {refresh_stats['refreshes']} performed "
+                             f"({refresh_stats['forced']} forced), {refresh_stats['skipped']} skipped")
+
             else:
                 logging.error("Failed to fetch weather data")
                 # Show error on display
-                self.display.update_display(None)
+                with self.display_lock:
+                    self.display.update_display(None)
                 
         except Exception as e:
             logging.error(f"Error during weather update: {e}")
             # Try to show error on display
             try:
-                self.display.update_display(None)
+                with self.display_lock:
+                    self.display.update_display(None)
             except:
                 logging.error("Failed to update display with error message")
+
+    def on_background_refresh(self, weather_data):
+        """Show fresh data from a refresh that finished after stale data was displayed"""
+        try:
+            logging.info("Background refresh completed, updating display with fresh data")
+            with self.display_lock:
+                self.display.update_display(weather_data)
+            self.last_update = datetime.now()
+        except Exception as e:
+            logging.error(f"Error updating display after background refresh: {e}")
     
     def run_initial_update(self):
         """Run initial update immediately"""
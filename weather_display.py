@@ -1,13 +1,17 @@
 from PIL import Image, ImageDraw, ImageFont
-from inky.auto import auto
 from datetime import datetime
 from config import *
+from display_sinks import open_display
 import math
 
 class WeatherDisplay:
-    def __init__(self):
+    def __init__(self, display=None):
+        """
+        Args:
+            display: Display sink to draw to; defaults to the DISPLAY_SINK from config
+        """
         try:
-            self.display = auto()
+            self.display = display or open_display(DISPLAY_SINK, DISPLAY_WIDTH, DISPLAY_HEIGHT, DISPLAY_PNG_PATH)
             print(f"Detected display: {self.display.resolution}")
         except Exception as e:
             print(f"Error initializing display: {e}")
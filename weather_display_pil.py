@@ -4,10 +4,24 @@ PIL-based Weather Display for Inky Impression
 Renders weather dashboard with actual PNG icons to match HTML design
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter
-from inky.auto import auto
+from PIL import Image, ImageDraw, ImageFilter
 from datetime import datetime
 import os
+from glyph_atlas import get_glyph_atlas
+from icon_cache import get_icon_cache
+from icon_atlas import get_icon_atlas, process_icon
+from image_ops import tint_icon, gradient_area_fill, vertical_gradient
+from spline import catmull_rom, catmull_rom_batch
+from color_grade import grade_frame
+from display_sinks import open_display
+from font_registry import get_font_registry, RegisteredFont
+from frame_diff import RefreshGate
+from layout import get_layout
+from panel_palette import detect_panel, driver_palette, quantize_to_panel
+from config import (ICON_CACHE_MAX_BYTES, ICON_ATLAS_ENABLED, ICON_ATLAS_DIR, ICON_ATLAS_SIZES,
+                    REFRESH_POLICY, REFRESH_FORCE_AFTER_MINUTES, DISPLAY_PANEL, DITHER_MODE,
+                    PANEL_CALIBRATION, TEXT_CACHE_MAX_ENTRIES, DISPLAY_SINK, DISPLAY_WIDTH, DISPLAY_HEIGHT,
+                    DISPLAY_PNG_PATH, LAYOUT_CACHE_DIR)
 
 
 def get_weather_icon(icon_code, wind_speed=0):
@@ -88,47 +102,37 @@ def get_weather_icon(icon_code, wind_speed=0):
 
 def bezier_curve(points, num_segments=50):
     """Generate smooth bezier curve points from a list of control points using Catmull-Rom splines"""
-    if len(points) < 2:
-        return points
-
-    result = []
-
-    # Catmull-Rom spline interpolation
-    for i in range(len(points) - 1):
-        # Get 4 points for the spline (with boundary handling)
-        p0 = points[max(0, i - 1)]
-        p1 = points[i]
-        p2 = points[i + 1]
-        p3 = points[min(len(points) - 1, i + 2)]
-
-        # Generate points along this segment
-        for t_step in range(num_segments):
-            t = t_step / num_segments
-            t2 = t * t
-            t3 = t2 * t
-
-            # Catmull-Rom basis functions
-            x = 0.5 * ((2 * p1[0]) +
-                      (-p0[0] + p2[0]) * t +
-                      (2 * p0[0] - 5 * p1[0] + 4 * p2[0] - p3[0]) * t2 +
-                      (-p0[0] + 3 * p1[0] - 3 * p2[0] + p3[0]) * t3)
-
-            y = 0.5 * ((2 * p1[1]) +
-                      (-p0[1] + p2[1]) * t +
-                      (2 * p0[1] - 5 * p1[1] + 4 * p2[1] - p3[1]) * t2 +
-                      (-p0[1] + 3 * p1[1] - 3 * p2[1] + p3[1]) * t3)
-
-            result.append((int(x), int(y)))
-
-    # Add the last point
-    result.append(points[-1])
-
-    return result
+    return catmull_rom(points, num_segments)
 
 class WeatherDisplay:
-    def __init__(self):
+    # Fonts load from the shared registry the first time they are used, at
+    # these 800x480 sizes scaled to the panel's layout
+    font_location = RegisteredFont('bold', 30)
+    font_date = RegisteredFont('regular', 17)
+    font_temp_large = RegisteredFont('regular', 90)
+    font_temp_unit = RegisteredFont('regular', 42)
+    font_feels = RegisteredFont('regular', 16)
+    font_description = RegisteredFont('medium', 17)
+    font_detail_label = RegisteredFont('regular', 13)
+    font_detail_value = RegisteredFont('bold', 18)
+    font_forecast_day = RegisteredFont('bold', 16)
+    font_forecast_temp = RegisteredFont('medium', 13)
+    font_axis = RegisteredFont('regular', 11)
+    font_footer = RegisteredFont('regular', 8)
+
+    # Detail rows per column: (icon, label), drawn as static chrome
+    DETAIL_COLUMNS = (
+        (('sunrise', 'Sunrise'), ('wind', 'Wind'), ('visibility', 'Visibility')),
+        (('sunset', 'Sunset'), ('humidity', 'Humidity'), ('aqi', 'Air Quality')),
+    )
+
+    def __init__(self, display=None):
+        """
+        Args:
+            display: Display sink to draw to; defaults to the DISPLAY_SINK from config
+        """
         try:
-            self.display = auto()
+            self.display = display or open_display(DISPLAY_SINK, DISPLAY_WIDTH, DISPLAY_HEIGHT, DISPLAY_PNG_PATH)
             print(f"Detected display: {self.display.resolution}")
         except Exception as e:
             print(f"Error initializing display: {e}")
@@ -139,6 +143,9 @@ class WeatherDisplay:
         self.width = self.display.width
         self.height = self.display.height
 
+        # Every position and size, scaled from the 800x480 design for this panel
+        self.layout = get_layout(self.width, self.height, LAYOUT_CACHE_DIR or None)
+
         # Colors - Matte dark theme (reduces glare)
         self.WHITE = (255, 255, 255)  # Text color
         self.BLACK = (0, 0, 0)           # Pure black
@@ -146,55 +153,38 @@ class WeatherDisplay:
         self.BORDER = (100, 100, 120)  # Lighter border for dark mode
         self.TEXT_SECONDARY = (200, 200, 220)  # Slightly dimmed text
 
-        # Try to load Inter fonts (fallback to DejaVu if not available)
-        try:
-            # Try Inter first - adjusted sizes
-            self.font_location = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Bold.ttf", 30)
-            self.font_date = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Regular.ttf", 17)
-            self.font_temp_large = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Regular.ttf", 90)
-            self.font_temp_unit = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Regular.ttf", 42)
-            self.font_feels = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Regular.ttf", 16)
-            self.font_description = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Medium.ttf", 17)
-            self.font_detail_label = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Regular.ttf", 13)
-            self.font_detail_value = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Bold.ttf", 18)
-            self.font_forecast_day = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Bold.ttf", 16)
-            self.font_forecast_temp = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Medium.ttf", 13)
-            self.font_axis = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Regular.ttf", 11)
-            self.font_footer = ImageFont.truetype("/usr/share/fonts/truetype/inter/Inter-Regular.ttf", 8)
-        except:
-            try:
-                # Fallback to DejaVu - adjusted sizes
-                self.font_location = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 30)
-                self.font_date = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 17)
-                self.font_temp_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 90)
-                self.font_temp_unit = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 42)
-                self.font_feels = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-                self.font_description = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 17)
-                self.font_detail_label = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 13)
-                self.font_detail_value = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 18)
-                self.font_forecast_day = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-                self.font_forecast_temp = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 13)
-                self.font_axis = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 11)
-                self.font_footer = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 8)
-            except Exception as e:
-                print(f"Warning: Could not load fonts: {e}")
-                print("Using default fonts")
-                # Fallback to default
-                self.font_location = ImageFont.load_default()
-                self.font_date = ImageFont.load_default()
-                self.font_temp_large = ImageFont.load_default()
-                self.font_temp_unit = ImageFont.load_default()
-                self.font_feels = ImageFont.load_default()
-                self.font_detail_label = ImageFont.load_default()
-                self.font_detail_value = ImageFont.load_default()
-                self.font_forecast_day = ImageFont.load_default()
-                self.font_forecast_temp = ImageFont.load_default()
-                self.font_axis = ImageFont.load_default()
-                self.font_footer = ImageFont.load_default()
+        # Static layers by (width, height, card count, graph shown), each
+        # with the detail icon file mtimes it was drawn from
+        self._chrome = {}
+
+        # Processed icons shared by every renderer in the process
+        self.icon_cache = get_icon_cache(ICON_CACHE_MAX_BYTES)
+        # Panels at another scale keep their own atlas rather than rebuilding the shared one
+        atlas_sizes = [self.layout.scale(size) for size in ICON_ATLAS_SIZES]
+        atlas_dir = ICON_ATLAS_DIR
+        if atlas_sizes != list(ICON_ATLAS_SIZES):
+            atlas_dir = os.path.join(ICON_ATLAS_DIR, 'icons@' + '-'.join(str(size) for size in atlas_sizes))
+        self.icon_atlas = get_icon_atlas('icons', atlas_dir, atlas_sizes) if ICON_ATLAS_ENABLED else None
+
+        # Frames are reduced to the panel's colours here rather than in the
+        # driver, against the driver's own palette when there is one
+        self.panel = detect_panel(self.display, DISPLAY_PANEL)
+        self.driver_palette = driver_palette(self.display)
+
+        # Skips the slow e-ink refresh when nothing visible has changed
+        self.refresh_gate = RefreshGate(self.panel, REFRESH_POLICY, REFRESH_FORCE_AFTER_MINUTES, DITHER_MODE,
+                                        self.driver_palette)
+        self.timestamp_box = None
+
+        # Fonts and text measurements shared by every renderer in the process
+        self.fonts = get_font_registry(TEXT_CACHE_MAX_ENTRIES)
 
     def load_icon(self, icon_name, size, wind_speed=0, force_day=False):
         """Load and resize an icon with high quality
 
+        Processed icons are cached, so the returned image may be shared and
+        must not be modified.
+
         Args:
             icon_name: The icon code (e.g., '01d', '01n') or UI icon name (e.g., 'sunrise')
             size: The size to resize the icon to
@@ -206,17 +196,30 @@ class WeatherDisplay:
 
         is_ui_icon = icon_name in ui_icons
         if is_ui_icon:
-            icon_path = f"icons/{icon_name}.png"
-            print(f"  Loading UI icon: {icon_name}")
+            mapped_icon = icon_name
         else:
             # Weather icon - use mapping function
             if force_day and icon_name.endswith('n'):
                 # For forecast cards, convert to day version
                 icon_name = icon_name[:-1] + 'd'
-                print(f"  Converting to day icon for forecast: {icon_name}")
 
             mapped_icon = get_weather_icon(icon_name, wind_speed)
-            icon_path = f"icons/{mapped_icon}.png"
+        icon_path = f"icons/{mapped_icon}.png"
+
+        cache_key = (mapped_icon, size, is_ui_icon, force_day)
+        icon = self.icon_cache.get(cache_key, icon_path)
+        if icon is not None:
+            return icon
+
+        if self.icon_atlas:
+            icon = self.icon_atlas.get(mapped_icon, size, icon_path)
+            if icon is not None:
+                self.icon_cache.set(cache_key, icon_path, icon)
+                return icon
+
+        if is_ui_icon:
+            print(f"  Loading UI icon: {icon_name}")
+        else:
             print(f"  Loading weather icon: {icon_name} -> {mapped_icon}")
 
         if not os.path.exists(icon_path):
@@ -225,44 +228,11 @@ class WeatherDisplay:
             return Image.new('RGBA', (size, size), (255, 255, 255, 0))
 
         try:
-            icon = Image.open(icon_path)
-            # Convert to RGBA if needed
-            if icon.mode != 'RGBA':
-                icon = icon.convert('RGBA')
-
-            # Use high-quality resize instead of thumbnail
-            icon = icon.resize((size, size), Image.Resampling.LANCZOS)
-
-            # Enhance sharpness for better display on e-ink
-            enhancer = ImageEnhance.Sharpness(icon)
-            icon = enhancer.enhance(1.5)  # Increase sharpness by 50%
-
-            # Boost color saturation for vibrant icons
-            color_enhancer = ImageEnhance.Color(icon)
-            icon = color_enhancer.enhance(1.8)  # 80% more saturated
-
-            # Boost contrast for icons to make them pop
-            contrast_enhancer = ImageEnhance.Contrast(icon)
-            icon = contrast_enhancer.enhance(1.5)  # 50% more contrast
-
-            # Extra enhancement for small UI icons
-            if is_ui_icon:
-                # Reduce brightness to deepen colors
-                brightness_enhancer = ImageEnhance.Brightness(icon)
-                icon = brightness_enhancer.enhance(0.85)  # 15% darker
-
-                # High contrast to make colors pop
-                contrast_enhancer2 = ImageEnhance.Contrast(icon)
-                icon = contrast_enhancer2.enhance(2.0)  # Double contrast
-
-                # Extra saturation boost for UI icons
-                color_enhancer2 = ImageEnhance.Color(icon)
-                icon = color_enhancer2.enhance(2.2)  # More than double saturation
-
-            # Make sunrise and sunset icons completely yellow
-            if icon_name in ('sunrise', 'sunset'):
-                icon = self.make_icon_yellow(icon)
+            with Image.open(icon_path) as source:
+                # Resize, enhance and tint with the same pipeline the atlas is built with
+                icon = process_icon(source, mapped_icon, size)
 
+            self.icon_cache.set(cache_key, icon_path, icon)
             return icon
         except Exception as e:
             print(f"Error loading icon {icon_path}: {e}")
@@ -270,152 +240,155 @@ class WeatherDisplay:
 
     def make_icon_yellow(self, icon):
         """Convert icon colors to yellow while preserving transparency"""
-        if icon.mode != 'RGBA':
-            icon = icon.convert('RGBA')
-
-        pixels = icon.load()
-        width, height = icon.size
-
-        # Yellow color (RGB: 255, 220, 0)
-        yellow = (255, 220, 0)
-
-        for y in range(height):
-            for x in range(width):
-                r, g, b, a = pixels[x, y]
-
-                # Only modify non-transparent pixels
-                if a > 0:
-                    # Calculate brightness of original pixel
-                    brightness = (r + g + b) / 3 / 255
+        return tint_icon(icon, (255, 220, 0))
 
-                    # Apply yellow with original brightness
-                    new_r = int(yellow[0] * brightness)
-                    new_g = int(yellow[1] * brightness)
-                    new_b = int(yellow[2] * brightness)
-
-                    pixels[x, y] = (new_r, new_g, new_b, a)
-
-        return icon
+    def draw_readout(self, img, draw, xy, text, font, fill):
+        """Draw a numeric readout from the font's glyph atlas, falling back to draw.text()"""
+        atlas = get_glyph_atlas(font)
+        if atlas.supports(text):
+            atlas.draw(img, xy, text, fill)
+        else:
+            draw.text(xy, text, font=font, fill=fill)
 
     def draw_header(self, draw, city, country, current_date, last_updated):
         """Draw centered header with location and date, timestamp in top right"""
+        header = self.layout['header']
+
         # Location - shifted down slightly more
         location = f"{city}, {country}"
-        bbox = draw.textbbox((0, 0), location, font=self.font_location)
-        text_width = bbox[2] - bbox[0]
+        text_width = self.fonts.text_width(self.font_location, location)
         x = (self.width - text_width) // 2
-        location_y = 22
+        location_y = header['location_y']
         draw.text((x, location_y), location, font=self.font_location, fill=self.WHITE)
 
         # Date - shifted down slightly more
-        bbox = draw.textbbox((0, 0), current_date, font=self.font_date)
-        text_width = bbox[2] - bbox[0]
+        text_width = self.fonts.text_width(self.font_date, current_date)
         x = (self.width - text_width) // 2
-        draw.text((x, 58), current_date, font=self.font_date, fill=self.TEXT_SECONDARY)
+        draw.text((x, location_y + header['date_dy']), current_date, font=self.font_date, fill=self.TEXT_SECONDARY)
 
         # Timestamp in top right corner, even with location
-        bbox = draw.textbbox((0, 0), last_updated, font=self.font_date)
-        text_width = bbox[2] - bbox[0]
-        draw.text((self.width - text_width - 80, location_y), last_updated,
+        right = self.width - header['timestamp_margin']
+        text_width = self.fonts.text_width(self.font_date, last_updated)
+        draw.text((right - text_width, location_y), last_updated,
                  font=self.font_date, fill=self.TEXT_SECONDARY)
 
-    def draw_current_weather(self, img, draw, weather_data, y_start=100):
+        # Box around any time the clock can show, so the refresh gate can
+        # ignore it: the widest digit in every position, and the time drawn now
+        widest = max('0123456789', key=lambda digit: self.fonts.text_width(self.font_date, digit))
+        samples = [f"{hour}:{widest * 2}{suffix}" for hour in (widest, f"1{widest}") for suffix in ('am', 'pm')]
+        boxes = []
+        for text in samples + [last_updated]:
+            bbox = self.fonts.measure(self.font_date, text)
+            x = right - (bbox[2] - bbox[0])
+            boxes.append((x + bbox[0], location_y + bbox[1], x + bbox[2], location_y + bbox[3]))
+        self.timestamp_box = (min(box[0] for box in boxes) - 2, min(box[1] for box in boxes) - 2,
+                              max(box[2] for box in boxes) + 2, max(box[3] for box in boxes) + 2)
+
+    def draw_current_weather(self, img, draw, weather_data):
         """Draw current weather section with icon and temperature"""
         current = weather_data['current']
+        geometry = self.layout['current']
 
         # Left side - icon moved up and left slightly
         wind_speed = current.get('wind_speed', 0)
         print(f"Loading MAIN weather icon: {current['icon']} (wind_speed={wind_speed})")
-        icon = self.load_icon(current['icon'], 152, wind_speed=wind_speed)
-        img.paste(icon, (60, y_start - 18), icon if icon.mode == 'RGBA' else None)
+        icon = self.load_icon(current['icon'], geometry['icon_size'], wind_speed=wind_speed)
+        img.paste(icon, (geometry['icon_x'], geometry['icon_y']), icon if icon.mode == 'RGBA' else None)
 
         # Temperature - moved up more
-        temp_x = 232
-        temp_y = y_start
+        temp_x = geometry['temp_x']
+        temp_y = geometry['temp_y']
 
         # Main temperature (just the number)
         temp_text = f"{current['temperature']}"
-        draw.text((temp_x, temp_y), temp_text, font=self.font_temp_large, fill=self.WHITE)
+        self.draw_readout(img, draw, (temp_x, temp_y), temp_text, self.font_temp_large, self.WHITE)
 
         # Get the width of the temperature number to position degree symbol
-        bbox = draw.textbbox((temp_x, temp_y), temp_text, font=self.font_temp_large)
-        degree_x = bbox[2] + 2
+        degree_x = temp_x + self.fonts.measure(self.font_temp_large, temp_text)[2] + geometry['unit_gap']
 
         # Degree symbol and F (proper sizing)
-        draw.text((degree_x, temp_y), "°F", font=self.font_temp_unit, fill=self.WHITE)
+        self.draw_readout(img, draw, (degree_x, temp_y), "°F", self.font_temp_unit, self.WHITE)
 
         # Weather description - shifted down more for bigger temp
         description_text = current.get('description', 'Clear')
-        draw.text((temp_x, temp_y + 94), description_text, font=self.font_description, fill=self.TEXT_SECONDARY)
+        draw.text((temp_x, temp_y + geometry['description_dy']), description_text, font=self.font_description, fill=self.TEXT_SECONDARY)
 
         # Feels like - shifted down more for bigger temp
         feels_text = f"Feels Like {current['feels_like']}°"
-        draw.text((temp_x, temp_y + 116), feels_text, font=self.font_feels, fill=self.TEXT_SECONDARY)
-
-    def draw_details(self, img, draw, weather_data, y_start=90):
-        """Draw two columns of weather details with icons"""
+        draw.text((temp_x, temp_y + geometry['feels_dy']), feels_text, font=self.font_feels, fill=self.TEXT_SECONDARY)
+
+    def _detail_positions(self):
+        """Top-left (x, y) of each detail row's icon, per column"""
+        geometry = self.layout['details']
+        return [[(col_x, geometry['y'] + i * geometry['row_spacing']) for i in range(len(column))]
+                for col_x, column in zip(geometry['columns'], self.DETAIL_COLUMNS)]
+
+    def draw_details_chrome(self, img, draw):
+        """Draw the detail icons and labels, which never change"""
+        geometry = self.layout['details']
+        for column, positions in zip(self.DETAIL_COLUMNS, self._detail_positions()):
+            for (icon_name, label), (x, y) in zip(column, positions):
+                icon = self.load_icon(icon_name, geometry['icon_size'])
+                img.paste(icon, (x, y), icon if icon.mode == 'RGBA' else None)
+                # Label - tighter spacing between icon and text
+                draw.text((x + geometry['text_dx'], y + geometry['label_dy']), label,
+                          font=self.font_detail_label, fill=self.TEXT_SECONDARY)
+
+    def draw_details(self, img, draw, weather_data):
+        """Draw the values of the two detail columns"""
         current = weather_data['current']
 
-        # Column positions - shifted right to use freed space
-        col1_x = 430
-        col2_x = 590
-        detail_y = y_start
-        row_spacing = 50  # More vertical spacing between rows
-
         # Column 1 details
-        details_col1 = [
-            ('sunrise', 'Sunrise', current['sunrise'].strftime('%I:%M %p').lstrip('0')),
-            ('wind', 'Wind', f"{current['wind_speed']:.1f} mph"),
-            ('visibility', 'Visibility', f"{current.get('visibility', 10):.1f} mi"),
+        values_col1 = [
+            current['sunrise'].strftime('%I:%M %p').lstrip('0'),
+            f"{current['wind_speed']:.1f} mph",
+            f"{current.get('visibility', 10):.1f} mi",
         ]
 
         # Column 2 details
-        details_col2 = [
-            ('sunset', 'Sunset', current['sunset'].strftime('%I:%M %p').lstrip('0')),
-            ('humidity', 'Humidity', f"{current['humidity']} %"),
-            ('aqi', 'Air Quality', f"{current.get('air_quality', {}).get('index', 0)} /10"),
+        values_col2 = [
+            current['sunset'].strftime('%I:%M %p').lstrip('0'),
+            f"{current['humidity']} %",
+            f"{current.get('air_quality', {}).get('index', 0)} /10",
         ]
 
-        # Draw column 1 - tighter spacing between icon and text
-        for i, (icon_name, label, value) in enumerate(details_col1):
-            y = detail_y + i * row_spacing
-            # Load and paste icon (38x38)
-            icon = self.load_icon(icon_name, 38)
-            img.paste(icon, (col1_x, y), icon if icon.mode == 'RGBA' else None)
-            # Draw label and value - adjusted for larger icon
-            draw.text((col1_x + 44, y + 4), label, font=self.font_detail_label, fill=self.TEXT_SECONDARY)
-            draw.text((col1_x + 44, y + 20), value, font=self.font_detail_value, fill=self.WHITE)
-
-        # Draw column 2 - tighter spacing between icon and text
-        for i, (icon_name, label, value) in enumerate(details_col2):
-            y = detail_y + i * row_spacing
-            # Load and paste icon (38x38)
-            icon = self.load_icon(icon_name, 38)
-            img.paste(icon, (col2_x, y), icon if icon.mode == 'RGBA' else None)
-            # Draw label and value - adjusted for larger icon
-            draw.text((col2_x + 44, y + 4), label, font=self.font_detail_label, fill=self.TEXT_SECONDARY)
-            draw.text((col2_x + 44, y + 20), value, font=self.font_detail_value, fill=self.WHITE)
-
-    def draw_graph_section(self, img, draw, hourly_data, temp_min, temp_max, y_start=245):
+        geometry = self.layout['details']
+        for values, positions in zip((values_col1, values_col2), self._detail_positions()):
+            for value, (x, y) in zip(values, positions):
+                draw.text((x + geometry['text_dx'], y + geometry['value_dy']), value,
+                          font=self.font_detail_value, fill=self.WHITE)
+
+    def _graph_geometry(self):
+        """Return (graph_x, graph_y, graph_width, graph_height)"""
+        geometry = self.layout['graph']
+        return geometry['x'], geometry['y'], geometry['width'], geometry['height']
+
+    def draw_graph_chrome(self, draw):
+        """Draw the rain axis labels, which never change"""
+        geometry = self.layout['graph']
+        graph_x, graph_y, graph_width, graph_height = self._graph_geometry()
+        label_x = graph_x + graph_width + geometry['rain_label_dx']
+
+        # Y-axis labels (right - rain %) - outside graph area, won't overlap
+        draw.text((label_x, graph_y - geometry['max_label_dy']), "100%", font=self.font_detail_label, fill=self.TEXT_SECONDARY)
+        draw.text((label_x, graph_y + graph_height - geometry['min_label_dy']), "0%", font=self.font_detail_label, fill=self.TEXT_SECONDARY)
+
+    def draw_graph_section(self, img, draw, hourly_data, temp_min, temp_max):
         """Draw temperature graph with time labels"""
         if not hourly_data or len(hourly_data) < 2:
             return
 
-        # Graph dimensions - shifted up, compressed from right
-        graph_x = 85  # Start position for graph line
-        graph_width = 590  # Compressed width from right side
-        graph_height = 80  # Increased height
-        graph_y = y_start + 12
+        geometry = self.layout['graph']
+        graph_x, graph_y, graph_width, graph_height = self._graph_geometry()
 
         # No border/background - just draw on white canvas
 
         # Y-axis labels (left - temperature) - outside graph area
-        draw.text((42, graph_y - 5), f"{temp_max}°F", font=self.font_detail_label, fill=self.TEXT_SECONDARY)
-        draw.text((42, graph_y + graph_height - 8), f"{temp_min}°F", font=self.font_detail_label, fill=self.TEXT_SECONDARY)
-
-        # Y-axis labels (right - rain %) - outside graph area, won't overlap
-        draw.text((graph_x + graph_width + 8, graph_y - 5), "100%", font=self.font_detail_label, fill=self.TEXT_SECONDARY)
-        draw.text((graph_x + graph_width + 8, graph_y + graph_height - 8), "0%", font=self.font_detail_label, fill=self.TEXT_SECONDARY)
+        label_x = geometry['temp_label_x']
+        self.draw_readout(img, draw, (label_x, graph_y - geometry['max_label_dy']), f"{temp_max}°F",
+                          self.font_detail_label, self.TEXT_SECONDARY)
+        self.draw_readout(img, draw, (label_x, graph_y + graph_height - geometry['min_label_dy']), f"{temp_min}°F",
+                          self.font_detail_label, self.TEXT_SECONDARY)
 
         # Calculate points for temperature line
         temps = [h['temp'] for h in hourly_data]
@@ -430,46 +403,6 @@ class WeatherDisplay:
             py = graph_y + graph_height - ((temp - temp_min) / temp_range) * graph_height
             points.append((int(px), int(py)))
 
-        # Draw gradient fill under the temperature line using alpha blending
-        ORANGE = (255, 140, 66)
-        BLUE = (100, 150, 255)
-
-        # Generate smooth curve points using bezier interpolation
-        smooth_temp_points = bezier_curve(points, num_segments=20) if len(points) > 1 else points
-
-        if len(smooth_temp_points) > 1:
-            # Create a temporary RGBA image for the gradient
-            overlay = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-
-            # Draw multiple layers with decreasing opacity to create gradient
-            num_layers = 30
-            for layer in range(num_layers):
-                # Calculate alpha (more transparent as we go down)
-                alpha = int(80 * (1 - layer / num_layers))
-
-                # Calculate Y offset for this layer
-                y_offset = int((graph_height * layer) / num_layers)
-
-                # Create polygon points for this layer using smooth curve
-                layer_points = []
-                for px, py in smooth_temp_points:
-                    layer_points.append((px, py + y_offset))
-
-                # Add bottom edge
-                layer_points.append((int(smooth_temp_points[-1][0]), int(graph_y + graph_height)))
-                layer_points.append((int(smooth_temp_points[0][0]), int(graph_y + graph_height)))
-
-                # Draw this layer
-                overlay_draw.polygon(layer_points, fill=(*ORANGE, alpha))
-
-            # Paste the gradient overlay onto the main image
-            img.paste(overlay, (0, 0), overlay)
-
-            # Draw the smooth temperature line on top
-            for i in range(len(smooth_temp_points) - 1):
-                draw.line([smooth_temp_points[i], smooth_temp_points[i + 1]], fill=ORANGE, width=3)
-
         # Calculate points for precipitation line chart
         rain_points = []
         for i, hour in enumerate(hourly_data):
@@ -479,53 +412,40 @@ class WeatherDisplay:
             py = graph_y + graph_height - (rain_pct / 100) * graph_height
             rain_points.append((int(px), int(py)))
 
-        # Generate smooth curve for precipitation line
-        if len(rain_points) > 1:
-            smooth_rain_points = bezier_curve(rain_points, num_segments=20)
-
-            # Create a temporary RGBA image for the blue gradient under precipitation line
-            rain_overlay = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-            rain_overlay_draw = ImageDraw.Draw(rain_overlay)
-
-            # Draw multiple layers with decreasing opacity to create gradient
-            num_layers = 30
-            for layer in range(num_layers):
-                # Calculate alpha (more transparent as we go down)
-                alpha = int(80 * (1 - layer / num_layers))
-
-                # Calculate Y offset for this layer
-                y_offset = int((graph_height * layer) / num_layers)
+        # Draw gradient fill under the temperature line using alpha blending
+        ORANGE = (255, 140, 66)
+        BLUE = (100, 150, 255)
 
-                # Create polygon points for this layer using smooth curve
-                layer_points = []
-                for px, py in smooth_rain_points:
-                    layer_points.append((px, py + y_offset))
+        # Generate smooth curve points for both lines in one batch
+        smooth_temp_points, smooth_rain_points = catmull_rom_batch([points, rain_points], num_segments=20)
 
-                # Add bottom edge
-                layer_points.append((int(smooth_rain_points[-1][0]), int(graph_y + graph_height)))
-                layer_points.append((int(smooth_rain_points[0][0]), int(graph_y + graph_height)))
+        if len(smooth_temp_points) > 1:
+            # Gradient fading out below the curve, drawn only within the graph area
+            gradient_area_fill(img, smooth_temp_points, graph_y + graph_height, ORANGE, graph_height)
 
-                # Draw this layer in blue
-                rain_overlay_draw.polygon(layer_points, fill=(*BLUE, alpha))
+            # Draw the smooth temperature line on top
+            for i in range(len(smooth_temp_points) - 1):
+                draw.line([smooth_temp_points[i], smooth_temp_points[i + 1]], fill=ORANGE, width=geometry['temp_line_width'])
 
-            # Paste the blue gradient overlay onto the main image
-            img.paste(rain_overlay, (0, 0), rain_overlay)
+        # Draw the smooth precipitation line and its gradient
+        if len(rain_points) > 1:
+            # Blue gradient under the precipitation line
+            gradient_area_fill(img, smooth_rain_points, graph_y + graph_height, BLUE, graph_height)
 
             # Draw the smooth precipitation line on top
             for i in range(len(smooth_rain_points) - 1):
-                draw.line([smooth_rain_points[i], smooth_rain_points[i + 1]], fill=BLUE, width=2)
+                draw.line([smooth_rain_points[i], smooth_rain_points[i + 1]], fill=BLUE, width=geometry['rain_line_width'])
 
         # Time labels below graph - show all time points (every 3 hours from API)
-        label_y = graph_y + graph_height + 10
+        label_y = graph_y + graph_height + geometry['time_label_dy']
         for i, hour in enumerate(hourly_data):
             px = graph_x + i * step
             time_text = hour['time']
-            bbox = draw.textbbox((0, 0), time_text, font=self.font_axis)
-            text_width = bbox[2] - bbox[0]
+            text_width = self.fonts.text_width(self.font_axis, time_text)
             draw.text((int(px - text_width // 2), label_y), time_text,
                      font=self.font_axis, fill=self.TEXT_SECONDARY)
 
-    def draw_forecast(self, img, draw, forecast_data, y_start=370):
+    def draw_forecast(self, img, draw, forecast_data):
         """Draw forecast cards starting with Today (6 days total)"""
         if not forecast_data:
             print("Warning: No forecast data available")
@@ -544,30 +464,42 @@ class WeatherDisplay:
             print(f"First card date: {daily_forecasts[0].get('date', 'Unknown')} ({daily_forecasts[0].get('day_name', 'Unknown')})")
             print(f"Last card date: {daily_forecasts[-1].get('date', 'Unknown')} ({daily_forecasts[-1].get('day_name', 'Unknown')})")
 
-        # Calculate card dimensions - maximum compression horizontally
-        cards_per_row = len(daily_forecasts)
-        total_spacing = 58 * 2  # Even larger left and right padding for smaller cards
-        gap_spacing = 3 * (cards_per_row - 1)  # Minimal spacing between cards
-        available_width = self.width - total_spacing - gap_spacing
-        card_width = available_width // cards_per_row
-        card_height = 90  # Smaller height
-
-        for i, day in enumerate(daily_forecasts):
-            card_x = 42 + i * (card_width + 3)  # Shifted right two tads
+        for i, (day, box) in enumerate(zip(daily_forecasts, self._forecast_card_boxes(len(daily_forecasts)))):
             # Override day name for first card to show "Today"
             day_display = day.copy()
             if i == 0:
                 day_display['day_name'] = 'Today'
             print(f"Forecast day {i}: {day_display.get('day_name', 'Unknown')} - Icon: {day.get('icon', 'N/A')}")
-            self.draw_forecast_card(img, draw, day_display, card_x, y_start, card_width, card_height)
+            self.draw_forecast_card(img, draw, day_display, *box)
 
-    def draw_forecast_card(self, img, draw, day_data, x, y, width, height):
-        """Draw a single forecast card with rounded corners"""
+    def _forecast_card_boxes(self, card_count):
+        """Return (x, y, width, height) of each forecast card"""
+        if not card_count:
+            return []
+
+        # Calculate card dimensions - maximum compression horizontally
+        geometry = self.layout['forecast']
+        total_spacing = geometry['margin'] * 2  # Even larger left and right padding for smaller cards
+        gap_spacing = geometry['gap'] * (card_count - 1)  # Minimal spacing between cards
+        available_width = self.width - total_spacing - gap_spacing
+        card_width = available_width // card_count
+
+        # Shifted right two tads
+        return [(geometry['left'] + i * (card_width + geometry['gap']), geometry['y'], card_width, geometry['height'])
+                for i in range(card_count)]
+
+    def draw_forecast_card_frame(self, draw, x, y, width, height, fill=None, border=None):
+        """Draw a forecast card's rounded background and border
+
+        fill and border override the card colours, e.g. to draw a coverage mask.
+        """
         # Draw rounded rectangle by drawing a rectangle and circles at corners
-        radius = 8  # Slightly smaller radius
+        radius = self.layout['forecast']['radius']
+        line_width = self.layout['forecast']['border_width']
 
         # Main rectangle body - semi-transparent dark background
-        card_bg = (15, 20, 30)  # Very dark blue
+        card_bg = fill if fill is not None else (15, 20, 30)  # Very dark blue
+        border = border if border is not None else self.BORDER
         draw.rectangle([x + radius, y, x + width - radius, y + height],
                       fill=card_bg, outline=None)
         draw.rectangle([x, y + radius, x + width, y + height - radius],
@@ -575,34 +507,37 @@ class WeatherDisplay:
 
         # Draw border with lighter color for dark mode
         # Top and bottom lines
-        draw.line([(x + radius, y), (x + width - radius, y)], fill=self.BORDER, width=2)
-        draw.line([(x + radius, y + height), (x + width - radius, y + height)], fill=self.BORDER, width=2)
+        draw.line([(x + radius, y), (x + width - radius, y)], fill=border, width=line_width)
+        draw.line([(x + radius, y + height), (x + width - radius, y + height)], fill=border, width=line_width)
         # Left and right lines
-        draw.line([(x, y + radius), (x, y + height - radius)], fill=self.BORDER, width=2)
-        draw.line([(x + width, y + radius), (x + width, y + height - radius)], fill=self.BORDER, width=2)
+        draw.line([(x, y + radius), (x, y + height - radius)], fill=border, width=line_width)
+        draw.line([(x + width, y + radius), (x + width, y + height - radius)], fill=border, width=line_width)
 
         # Draw corner arcs
-        draw.arc([x, y, x + radius*2, y + radius*2], start=180, end=270, fill=self.BORDER, width=2)
-        draw.arc([x + width - radius*2, y, x + width, y + radius*2], start=270, end=360, fill=self.BORDER, width=2)
-        draw.arc([x, y + height - radius*2, x + radius*2, y + height], start=90, end=180, fill=self.BORDER, width=2)
-        draw.arc([x + width - radius*2, y + height - radius*2, x + width, y + height], start=0, end=90, fill=self.BORDER, width=2)
+        draw.arc([x, y, x + radius*2, y + radius*2], start=180, end=270, fill=border, width=line_width)
+        draw.arc([x + width - radius*2, y, x + width, y + radius*2], start=270, end=360, fill=border, width=line_width)
+        draw.arc([x, y + height - radius*2, x + radius*2, y + height], start=90, end=180, fill=border, width=line_width)
+        draw.arc([x + width - radius*2, y + height - radius*2, x + width, y + height], start=0, end=90, fill=border, width=line_width)
+
+    def draw_forecast_card(self, img, draw, day_data, x, y, width, height):
+        """Draw a single forecast card's day, icon and temperatures onto its frame"""
+        geometry = self.layout['forecast']
 
         # Day name (centered)
         day_name = day_data['day_name']
-        bbox = draw.textbbox((0, 0), day_name, font=self.font_forecast_day)
-        text_width = bbox[2] - bbox[0]
-        draw.text((x + (width - text_width) // 2, y + 6), day_name,
+        text_width = self.fonts.text_width(self.font_forecast_day, day_name)
+        draw.text((x + (width - text_width) // 2, y + geometry['day_dy']), day_name,
                  font=self.font_forecast_day, fill=self.WHITE)
 
-        # Weather icon (centered, 46x46)
-        icon_size = 46
+        # Weather icon (centered)
+        icon_size = geometry['icon_size']
         icon_code = day_data.get('icon', '01d')
 
         print(f"  Loading icon: {icon_code} at size {icon_size}")
 
         icon = self.load_icon(icon_code, icon_size, wind_speed=0, force_day=True)
         icon_x = int(x + (width - icon_size) // 2)
-        icon_y = int(y + 25)
+        icon_y = int(y + geometry['icon_dy'])
 
         # Convert icon to have proper alpha channel and paste
         if icon:
@@ -617,15 +552,63 @@ class WeatherDisplay:
             except Exception as e:
                 print(f"  Error pasting icon: {e}")
                 # Draw a placeholder circle if icon fails
-                draw.ellipse([icon_x, icon_y, icon_x + 40, icon_y + 40],
-                           outline=self.BLACK, width=2)
+                placeholder = self.layout.scale(40)
+                draw.ellipse([icon_x, icon_y, icon_x + placeholder, icon_y + placeholder],
+                           outline=self.BLACK, width=geometry['border_width'])
 
         # Temperature range (centered, adjusted for smaller card)
         temp_text = f"{day_data['max_temp']} / {day_data['min_temp']}°"
-        bbox = draw.textbbox((0, 0), temp_text, font=self.font_forecast_temp)
-        text_width = bbox[2] - bbox[0]
-        draw.text((x + (width - text_width) // 2, y + 73), temp_text,
-                 font=self.font_forecast_temp, fill=self.WHITE)
+        text_width = self.fonts.text_width(self.font_forecast_temp, temp_text)
+        self.draw_readout(img, draw, (x + (width - text_width) // 2, y + geometry['temp_dy']), temp_text,
+                          self.font_forecast_temp, self.WHITE)
+
+    def get_chrome(self, card_count, show_graph):
+        """Return the cached static layer for this layout
+
+        The static layer has the background, detail icons and labels, rain
+        axis labels and forecast card frames. Returns (image, frames) where
+        frames is (box, image, mask) for the card frames, which are pasted
+        back over the graph fill like they used to be drawn after it, or None.
+        The layer is redrawn when a detail icon file is replaced, like the
+        icon cache's own entries.
+        """
+        key = (self.width, self.height, card_count, show_graph)
+        icon_mtimes = self._detail_icon_mtimes()
+        cached = self._chrome.get(key)
+        if cached is not None and cached[0] == icon_mtimes:
+            return cached[1]
+
+        img = vertical_gradient((self.width, self.height), self.DARK_BLUE, self.BLACK).copy()
+        draw = ImageDraw.Draw(img)
+        self.draw_details_chrome(img, draw)
+        if show_graph:
+            self.draw_graph_chrome(draw)
+
+        frames = None
+        boxes = self._forecast_card_boxes(card_count)
+        if boxes:
+            mask = Image.new('L', (self.width, self.height), 0)
+            mask_draw = ImageDraw.Draw(mask)
+            for box in boxes:
+                self.draw_forecast_card_frame(draw, *box)
+                self.draw_forecast_card_frame(mask_draw, *box, fill=255, border=255)
+            frame_box = mask.getbbox()
+            frames = (frame_box, img.crop(frame_box), mask.crop(frame_box))
+
+        chrome = (img, frames)
+        self._chrome[key] = (icon_mtimes, chrome)
+        return chrome
+
+    def _detail_icon_mtimes(self):
+        """Modification times of the detail icon files baked into the static layer"""
+        mtimes = []
+        for column in self.DETAIL_COLUMNS:
+            for icon_name, _ in column:
+                try:
+                    mtimes.append(os.stat(f"icons/{icon_name}.png").st_mtime_ns)
+                except OSError:
+                    mtimes.append(None)
+        return tuple(mtimes)
 
     def prepare_template_data(self, weather_data):
         """Prepare data for display rendering"""
@@ -669,56 +652,64 @@ class WeatherDisplay:
             'last_updated': weather_data.get('last_updated', datetime.now()).strftime('%I:%M%p').lstrip('0').lower()
         }
 
+    def render_frame(self, weather_data):
+        """Render weather data to a full-colour frame, or return None if there is nothing to show"""
+        if not weather_data or not weather_data.get('current'):
+            print("No weather data available")
+            return None
+
+        # Prepare data
+        data = self.prepare_template_data(weather_data)
+        if not data:
+            print("Could not prepare template data")
+            return None
+
+        # Start from the cached static layer: background, labels, detail icons, card frames
+        card_count = len(data['forecast'][0:6])
+        chrome, frames = self.get_chrome(card_count, show_graph=len(data['hourly_data']) >= 2)
+        img = chrome.copy()
+        draw = ImageDraw.Draw(img)
+
+        # Draw the data-dependent sections
+        self.draw_header(draw, data['city'], data['country'], data['current_date'], data['last_updated'])
+        self.draw_current_weather(img, draw, data)
+        self.draw_details(img, draw, data)
+        self.draw_graph_section(img, draw, data['hourly_data'], data['temp_min'], data['temp_max'])
+        if frames:
+            # Card frames stay on top of the graph fill
+            frame_box, frame_img, frame_mask = frames
+            img.paste(frame_img, frame_box[:2], frame_mask)
+        self.draw_forecast(img, draw, data['forecast'])
+
+        # Enhance for e-ink display: 40% more contrast for better visibility,
+        # 30% more saturation for more vivid icons, then the panel's calibration
+        return grade_frame(img, contrast=1.4, saturation=1.3, gamma=PANEL_CALIBRATION.get(self.panel))
+
     def update_display(self, weather_data):
         """Update the display with weather data"""
         try:
-            if not weather_data or not weather_data.get('current'):
-                print("No weather data available")
+            img = self.render_frame(weather_data)
+            if img is None:
                 return
 
-            # Prepare data
-            data = self.prepare_template_data(weather_data)
-            if not data:
-                print("Could not prepare template data")
-                return
-
-            # Create image with dark gradient background
-            img = Image.new("RGB", (self.width, self.height))
-            draw = ImageDraw.Draw(img)
-
-            # Draw gradient background from dark blue/black to black
-            for y in range(self.height):
-                # Calculate gradient factor (0 at top, 1 at bottom)
-                factor = y / self.height
-                # Interpolate between DARK_BLUE and BLACK
-                r = int(self.DARK_BLUE[0] * (1 - factor) + self.BLACK[0] * factor)
-                g = int(self.DARK_BLUE[1] * (1 - factor) + self.BLACK[1] * factor)
-                b = int(self.DARK_BLUE[2] * (1 - factor) + self.BLACK[2] * factor)
-                draw.line([(0, y), (self.width, y)], fill=(r, g, b))
-
-            # Draw all sections
-            self.draw_header(draw, data['city'], data['country'], data['current_date'], data['last_updated'])
-            self.draw_current_weather(img, draw, data, y_start=100)
-            self.draw_details(img, draw, data, y_start=90)
-            self.draw_graph_section(img, draw, data['hourly_data'], data['temp_min'], data['temp_max'], y_start=245)
-            self.draw_forecast(img, draw, data['forecast'], y_start=370)
-
-            # Enhance contrast for e-ink display
-            # Increase contrast for better visibility
-            contrast_enhancer = ImageEnhance.Contrast(img)
-            img = contrast_enhancer.enhance(1.4)  # 40% more contrast
-
-            # Boost color saturation for more vivid icons
-            color_enhancer = ImageEnhance.Color(img)
-            img = color_enhancer.enhance(1.3)  # 30% more saturated
-
             # Save for debugging
             img.save('weather_display.png')
             print(f"Weather display saved as weather_display.png")
 
-            # Display on e-ink
-            self.display.set_image(img)
+            # Quantize and dither to the panel palette; the driver shows 'P' images as-is
+            panel_img = quantize_to_panel(img, self.panel, DITHER_MODE, self.driver_palette)
+
+            # Display on e-ink, unless the panel would show the same picture
+            ignore_boxes = [self.timestamp_box] if self.timestamp_box else []
+            refresh, digest = self.refresh_gate.should_refresh(img, ignore_boxes, quantized=panel_img)
+            if not refresh:
+                print("Display unchanged, skipping refresh")
+                return
+
+            self.display.set_image(panel_img)
             self.display.show()
+            # Only now, so a refresh that raised is retried on the next update
+            self.refresh_gate.mark_shown(digest)
 
             print(f"Weather display updated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 